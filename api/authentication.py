@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+
+from .db import read_from_primary
+
+USER_CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+USER_CACHE_KEY = 'auth:user:{}'
+
+
+def get_access_token(user):
+    access = RefreshToken.for_user(user).access_token
+    for claim in USER_CLAIMS:
+        access[claim] = getattr(user, claim)
+    return access
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+def get_cached_user_fields(user_id):
+    key = USER_CACHE_KEY.format(user_id)
+    fields = cache.get(key)
+    if fields is None:
+        # Из реплики в кэш легла бы старая роль (или пользователя там
+        # ещё нет), и её отдавали бы до истечения срока.
+        with read_from_primary():
+            fields = User.objects.filter(pk=user_id).values(
+                *USER_CLAIMS, 'is_active'
+            ).first()
+        if fields is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        cache.set(key, fields, settings.JWT_USER_CACHE_TIMEOUT)
+    return fields
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без загрузки пользователя из базы.
+
+    Пользователь собирается из id и полей роли: при включённом
+    JWT_USER_CACHE_TIMEOUT — из кэша (при промахе один запрос к базе),
+    иначе прямо из claims токена. Это несохранённый экземпляр User,
+    в котором заполнены только id, username, role, is_staff и
+    is_superuser: этого хватает для проверок прав и для внешних ключей.
+    Кому нужен полный профиль, загружает его сам.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        if settings.JWT_USER_CACHE_TIMEOUT:
+            fields = get_cached_user_fields(user_id)
+        elif all(claim in validated_token for claim in USER_CLAIMS):
+            fields = {claim: validated_token[claim] for claim in USER_CLAIMS}
+        else:
+            with read_from_primary():
+                return super().get_user(validated_token)
+        if not fields.get('is_active', True):
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        user = User(id=user_id, **fields)
+        user._state.adding = False
+        return user
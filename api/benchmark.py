@@ -0,0 +1,302 @@
+import itertools
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from reviews.csv_data import (DATA_DIR, TABLES, chunked, keep_auto_now,
+                              read_objects)
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from reviews.ratings import rebuild_ratings
+from users.models import User
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Создаёт отдельную тестовую базу, чтобы не трогать рабочие данные."""
+    old_name = connection.settings_dict['NAME']
+    setup_test_environment()
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+        teardown_test_environment()
+
+
+def bulk_insert(model, objects, batch_size=5000):
+    for chunk in chunked(objects, batch_size):
+        model.objects.bulk_create(chunk)
+
+
+def seed_catalog(titles=100, reviews=0, genres=10, categories=3,
+                 batch_size=5000):
+    users_count = max(1, -(-reviews // max(titles, 1)))
+    bulk_insert(User, (
+        User(username=f'bench_{i}', email=f'bench_{i}@yamdb.fake')
+        for i in range(users_count)
+    ), batch_size)
+    bulk_insert(Category, (
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(categories)
+    ), batch_size)
+    bulk_insert(Genre, (
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(genres)
+    ), batch_size)
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    bulk_insert(Title, (
+        Title(
+            name=f'Произведение {i}',
+            year=1900 + i % 120,
+            description=f'Описание произведения {i}',
+            author_id=user_ids[0],
+            category_id=category_ids[i % len(category_ids)],
+        ) for i in range(titles)
+    ), batch_size)
+    title_ids = list(Title.objects.order_by('id').values_list('id', flat=True))
+    bulk_insert(GenreTitle, (
+        GenreTitle(title_id=title_id, genre_id=genre_ids[i % len(genre_ids)])
+        for i, title_id in enumerate(title_ids)
+    ), batch_size)
+    bulk_insert(Review, (
+        Review(
+            title_id=title_ids[i % len(title_ids)],
+            author_id=user_ids[i // len(title_ids)],
+            text=f'Отзыв {i}',
+            score=i % 10 + 1,
+        ) for i in range(reviews)
+    ), batch_size)
+    rebuild_ratings()
+
+
+# Ссылки между таблицами CSV: при копировании id сдвигаются вместе.
+CSV_REFERENCES = {
+    'id': None,
+    'author_id': 'users',
+    'category_id': 'category',
+    'genre_id': 'genre',
+    'title_id': 'titles',
+    'review_id': 'review',
+}
+CSV_UNIQUE_FIELDS = {
+    'users': ('username', 'email'),
+    'category': ('slug',),
+    'genre': ('slug',),
+}
+
+
+def copy_csv_objects(table, objects, copy, offsets):
+    fields = [field.attname for field in table.model._meta.concrete_fields]
+    for obj in objects:
+        values = {name: getattr(obj, name) for name in fields}
+        if copy:
+            for name, reference in CSV_REFERENCES.items():
+                if name in values and values[name] is not None:
+                    values[name] += copy * offsets[reference or table.name]
+            for name in CSV_UNIQUE_FIELDS.get(table.name, ()):
+                values[name] = f'{copy}-{values[name]}'
+        yield table.model(**values)
+
+
+def seed_from_csv(scale=1, path=DATA_DIR, batch_size=5000):
+    """Заполняет базу scale копиями CSV из static/data.
+
+    Сохраняются пропорции исходных данных: жанров и отзывов на
+    произведение, комментариев на отзыв и длина текстов. Произведения
+    принадлежат первому администратору своей копии.
+    """
+    objects = {}
+    for table in TABLES:
+        objects[table.name] = list(
+            read_objects(table, os.path.join(path, table.filename))
+        )
+    admin_id = next(
+        user.pk for user in objects['users'] if user.role == User.ADMIN
+    )
+    for title in objects['titles']:
+        title.author_id = admin_id
+    offsets = {
+        name: max(obj.pk for obj in rows) for name, rows in objects.items()
+    }
+    for table in TABLES:
+        with keep_auto_now(table.model):
+            bulk_insert(table.model, (
+                obj for copy in range(scale)
+                for obj in copy_csv_objects(
+                    table, objects[table.name], copy, offsets
+                )
+            ), batch_size)
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [table.model for table in TABLES]
+    )
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+    rebuild_ratings()
+
+
+def measure(func, repeat=20, warmup=2):
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(durations):
+    return {
+        'count': len(durations),
+        'mean_ms': statistics.mean(durations) * 1000,
+        'p50_ms': percentile(durations, 0.50) * 1000,
+        'p95_ms': percentile(durations, 0.95) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+    }
+
+
+def run_load(urls, concurrency=10, duration=10.0, headers=None):
+    """Нагружает запущенный сервер из concurrency потоков.
+
+    Каждый поток держит свою keep-alive сессию и по кругу запрашивает
+    urls до истечения duration секунд. Возвращает длительности успешных
+    запросов, число ошибок и фактическое время теста.
+    """
+    import requests
+
+    durations = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(offset):
+        session = requests.Session()
+        session.headers.update(headers or {})
+        local, failed = [], 0
+        for url in itertools.islice(itertools.cycle(urls), offset, None):
+            if time.monotonic() >= deadline:
+                break
+            started = time.perf_counter()
+            try:
+                ok = session.get(url).status_code < 500
+            except requests.RequestException:
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - started)
+            else:
+                failed += 1
+        with lock:
+            durations.extend(local)
+            errors.append(failed)
+
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=worker, args=(number,))
+        for number in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return durations, sum(errors), time.monotonic() - started
+
+
+def hold_slow_clients(url, count, duration, interval=1.0):
+    """Держит count медленных клиентов в фоновом потоке.
+
+    Каждый клиент открывает соединение и присылает заголовки запроса по
+    одной строке раз в interval секунд, пока не истечёт duration. Так
+    ведут себя клиенты на плохой сети: sync-воркер gunicorn ждёт запрос
+    целиком, а в режиме ASGI его дочитывает цикл событий.
+    """
+    parts = urlsplit(url)
+    address = (parts.hostname, parts.port or 80)
+    deadline = time.monotonic() + duration
+
+    def hold():
+        sockets = []
+        for _ in range(count):
+            try:
+                client = socket.create_connection(address, timeout=interval)
+                client.sendall(
+                    f'GET /api/v1/titles/ HTTP/1.1\r\n'
+                    f'Host: {parts.netloc}\r\n'.encode()
+                )
+            except OSError:
+                continue
+            sockets.append(client)
+        number = 0
+        while time.monotonic() < deadline and sockets:
+            time.sleep(interval)
+            number += 1
+            for client in list(sockets):
+                try:
+                    client.sendall(f'X-Slow-{number}: 1\r\n'.encode())
+                except OSError:
+                    sockets.remove(client)
+        for client in sockets:
+            client.close()
+
+    thread = threading.Thread(target=hold, daemon=True)
+    thread.start()
+    return thread
+
+
+def read_log(path):
+    """Журнал запросов: JSONL со строками {"method": ..., "path": ...}."""
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def replay(client, entries, conditional=False):
+    """Проигрывает журнал через тестовый клиент Django.
+
+    С conditional=True клиент ведёт себя как браузер: запоминает ETag
+    каждого адреса и присылает его в If-None-Match. Возвращает счётчики
+    ответов по статусам, переданные байты тел и процессорное время.
+    """
+    etags = {}
+    stats = Counter()
+    started = time.process_time()
+    for entry in entries:
+        method = entry.get('method', 'GET').upper()
+        path = entry['path']
+        if method != 'GET':
+            client.generic(
+                method, path, json.dumps(entry.get('body', {})),
+                content_type='application/json',
+            )
+            stats['writes'] += 1
+            continue
+        headers = {}
+        if conditional and path in etags:
+            headers['HTTP_IF_NONE_MATCH'] = etags[path]
+        response = client.get(path, **headers)
+        if response.has_header('ETag'):
+            etags[path] = response['ETag']
+        stats[response.status_code] += 1
+        stats['bytes'] += len(response.content)
+    stats['cpu_ms'] = (time.process_time() - started) * 1000
+    return stats
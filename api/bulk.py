@@ -0,0 +1,185 @@
+from django.db import connection
+from rest_framework import serializers
+
+from reviews.csv_data import chunked
+from reviews.deletion import delete_rows
+
+BATCH_SIZE = 1000
+NOT_FOUND = 'Объект с {field}={value} не существует.'
+DUPLICATE = 'Значение {value} повторяется в запросе.'
+TAKEN = 'Данное имя занято!'
+REQUIRED = 'Обязательное поле.'
+
+
+def bulk_insert(model, objects, fetch_ids=True):
+    """bulk_create пачками; по умолчанию заполняет pk у объектов."""
+    for chunk in chunked(objects, BATCH_SIZE):
+        model.objects.bulk_create(chunk)
+    if (not fetch_ids or not objects
+            or connection.features.can_return_ids_from_bulk_insert):
+        return objects
+    # SQLite не возвращает id из пакетной вставки. Вставка идёт внутри
+    # транзакции, которая держит блокировку записи, поэтому последние
+    # len(objects) id принадлежат именно этим объектам.
+    ids = list(
+        model.objects.order_by('-pk').values_list('pk', flat=True)
+        [:len(objects)]
+    )
+    for obj, pk in zip(objects, reversed(ids)):
+        obj.pk = pk
+    return objects
+
+
+def add_error(errors, index, field, message):
+    errors[index].setdefault(field, []).append(message)
+
+
+def group_positions(items, field, errors):
+    positions = {}
+    for index, item in enumerate(items):
+        if field not in item:
+            add_error(errors, index, field, REQUIRED)
+            continue
+        positions.setdefault(item[field], []).append(index)
+    for value, indexes in positions.items():
+        for index in indexes[1:]:
+            add_error(errors, index, field, DUPLICATE.format(value=value))
+    return positions
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Проверяет и записывает список объектов пакетно.
+
+    Поля дочернего сериализатора проверяются без обращений к базе.
+    Уникальность (Meta.unique_fields), ссылки по slug (Meta.related_fields)
+    и объекты для обновления (Meta.lookup_field) ищутся одним запросом на
+    поле, а ошибки возвращаются списком по позициям массива. Для
+    обновления в instance передаётся queryset, в котором ищутся объекты.
+    """
+
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+        errors = [{} for _ in items]
+        meta = self.child.Meta
+        if self.instance is None:
+            for field in getattr(meta, 'unique_fields', ()):
+                self.check_unique(items, errors, field)
+        else:
+            self.find_instances(items, errors, meta.lookup_field)
+        for field, model in getattr(meta, 'related_fields', {}).items():
+            self.resolve_related(items, errors, field, model)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def check_unique(self, items, errors, field):
+        positions = group_positions(items, field, errors)
+        taken = self.child.Meta.model.objects.in_bulk(
+            list(positions), field_name=field
+        )
+        for value in taken:
+            for index in positions[value]:
+                add_error(errors, index, field, TAKEN)
+
+    def find_instances(self, items, errors, field):
+        positions = group_positions(items, field, errors)
+        self.instances = self.instance.in_bulk(
+            list(positions), field_name=field
+        )
+        for value, indexes in positions.items():
+            if value not in self.instances:
+                add_error(
+                    errors, indexes[0], field,
+                    NOT_FOUND.format(field=field, value=value)
+                )
+
+    def resolve_related(self, items, errors, field, model):
+        slugs = set()
+        for item in items:
+            value = item.get(field)
+            if isinstance(value, list):
+                slugs.update(value)
+            elif value is not None:
+                slugs.add(value)
+        if not slugs:
+            return
+        found = model.objects.in_bulk(list(slugs), field_name='slug')
+        for index, item in enumerate(items):
+            if field not in item:
+                continue
+            value = item[field]
+            many = isinstance(value, list)
+            values = list(dict.fromkeys(value)) if many else [value]
+            missing = [slug for slug in values if slug not in found]
+            for slug in missing:
+                add_error(
+                    errors, index, field,
+                    NOT_FOUND.format(field='slug', value=slug)
+                )
+            if not missing:
+                objects = [found[slug] for slug in values]
+                item[field] = objects if many else objects[0]
+
+    def get_many_to_many(self):
+        model = self.child.Meta.model
+        return [
+            name for name in getattr(self.child.Meta, 'related_fields', {})
+            if model._meta.get_field(name).many_to_many
+        ]
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        many_to_many = self.get_many_to_many()
+        objects = [
+            model(**{
+                name: value for name, value in item.items()
+                if name not in many_to_many and name != 'id'
+            })
+            for item in validated_data
+        ]
+        bulk_insert(model, objects)
+        self.set_many_to_many(objects, validated_data, many_to_many)
+        return objects
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        lookup_field = self.child.Meta.lookup_field
+        many_to_many = self.get_many_to_many()
+        objects = []
+        fields = set()
+        for item in validated_data:
+            obj = self.instances[item[lookup_field]]
+            for name, value in item.items():
+                if name not in many_to_many and name != lookup_field:
+                    setattr(obj, name, value)
+                    fields.add(name)
+            objects.append(obj)
+        if fields:
+            model.objects.bulk_update(objects, sorted(fields))
+        self.set_many_to_many(
+            objects, validated_data, many_to_many, replace=True
+        )
+        return objects
+
+    def set_many_to_many(self, objects, validated_data, names,
+                         replace=False):
+        model = self.child.Meta.model
+        for name in names:
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            changed = [
+                (obj, item[name])
+                for obj, item in zip(objects, validated_data)
+                if name in item
+            ]
+            if replace:
+                # Без сигналов на каждую строку: кэш и версии объектов
+                # сбрасывает представление одним вызовом после записи.
+                for chunk in chunked(changed, BATCH_SIZE):
+                    delete_rows(through, source, [obj.pk for obj, _ in chunk])
+            bulk_insert(through, [
+                through(**{source: obj.pk, target: related.pk})
+                for obj, values in changed for related in values
+            ], fetch_ids=False)
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from .db import read_from_primary
+
+VERSION_KEY = 'catalog:version:{}'
+RESPONSE_KEY = 'catalog:response:{}:{}'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def count(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_versions(names):
+    cache = get_cache()
+    keys = [VERSION_KEY.format(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Начинаем с текущего времени, а не с 1: после вытеснения
+            # ключа старые записи не должны снова стать актуальными.
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*names):
+    cache = get_cache()
+    for name in names:
+        key = VERSION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), None)
+
+
+def invalidate_on_commit(*names):
+    """invalidate после COMMIT текущей транзакции, вне её — сразу.
+
+    Иначе GET между сбросом версии и COMMIT прочитал бы старые данные и
+    положил их в кэш под новой версией до истечения срока.
+    """
+    transaction.on_commit(lambda: invalidate(*names))
+
+
+class CatalogCacheMixin:
+    """Кэширует ответы GET-запросов каталога.
+
+    Ключ строится из пути, хоста, разрешённых параметров запроса и версий
+    ресурсов, от которых зависит ответ. Сигналы из api.signals повышают
+    версии при изменении данных, и старые записи больше не читаются.
+    """
+    cache_resource = None
+    cache_query_params = ('limit', 'offset')
+
+    def get_cache_versions(self):
+        return [self.cache_resource]
+
+    def get_cache_key(self, request):
+        params = sorted(request.query_params.lists())
+        if any(name not in self.cache_query_params for name, _ in params):
+            return None
+        versions = get_versions(self.get_cache_versions())
+        raw = '|'.join([
+            request.get_host(), request.path, repr(params), repr(versions)
+        ])
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        return RESPONSE_KEY.format(self.cache_resource, digest)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        # Снимки списка (api.snapshots) строятся с подменённым хостом,
+        # такой ответ в кэш класть нельзя.
+        if (not settings.CATALOG_CACHE_ENABLED
+                or getattr(request, 'snapshot_build', False)
+                or getattr(request.accepted_renderer, 'format', None)
+                != 'json'):
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        cached = get_cache().get(key)
+        if cached is not None:
+            count('hits')
+            response = HttpResponse(
+                cached, content_type=request.accepted_media_type
+            )
+            response['X-Cache'] = 'HIT'
+            return response
+        count('misses')
+        with read_from_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            get_cache().set(
+                key, response.content, settings.CATALOG_CACHE_TIMEOUT
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CatalogCacheMixin):
+    """То же для карточки объекта: кэшируются и список, и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,45 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified до выборки и сериализации данных.
+
+    get_version() возвращает дешёвую версию ответа — пару (version,
+    modified) произведения, которую reviews.signals повышают при любом
+    изменении произведения, его отзывов и комментариев. Если версии нет,
+    запрос обрабатывается как обычно.
+    """
+
+    def get_version(self):
+        return None
+
+    def get_etag(self, version, modified):
+        renderer = getattr(self.request.accepted_renderer, 'format', '')
+        return f'W/"{version}-{modified.timestamp():.6f}-{renderer}"'
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version = self.get_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(*version)
+        last_modified = int(version[1].timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
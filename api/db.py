@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PIN_KEY = 'replica:pin:{}'
+
+logger = logging.getLogger('api.db')
+
+_local = threading.local()
+# Алиас реплики -> до какого момента (time.monotonic) её не выбирать.
+down_until = {}
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые больше не работают.
+
+    Вызывается в начале запроса: иначе первый запрос после разрыва
+    соединения сервером БД завершился бы ошибкой 500. Каждое соединение
+    проверяется не чаще раза в DB_CONN_HEALTH_CHECK_INTERVAL секунд,
+    чтобы не добавлять SELECT 1 к каждому запросу.
+    """
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        checked = getattr(connection, 'health_checked_at', None)
+        if (checked is not None
+                and now - checked < settings.DB_CONN_HEALTH_CHECK_INTERVAL):
+            continue
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
+
+
+def pin_key(request):
+    """Ключ клиента: токен из Authorization, а без него — IP."""
+    ident = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or BaseThrottle().get_ident(request)
+    )
+    return PIN_KEY.format(hashlib.md5(ident.encode()).hexdigest())
+
+
+def pick_replica():
+    """Случайная доступная реплика или None, если все недоступны.
+
+    Реплика, к которой не удалось подключиться, пропускается
+    REPLICA_RETRY_SECONDS секунд.
+    """
+    replicas = list(settings.DATABASE_REPLICAS)
+    random.shuffle(replicas)
+    now = time.monotonic()
+    for alias in replicas:
+        if down_until.get(alias, 0) > now:
+            continue
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning('Реплика %s недоступна', alias, exc_info=True)
+            down_until[alias] = now + settings.REPLICA_RETRY_SECONDS
+            continue
+        return alias
+    return None
+
+
+@contextmanager
+def read_from_primary():
+    """Чтение из default внутри запроса, который читает из реплики.
+
+    Нужно всему, что сохраняет прочитанное надолго (кэш ответов, снимки):
+    после записи версия в кэше уже новая, а реплика может отставать, и
+    под новой версией легли бы старые данные.
+    """
+    alias = getattr(_local, 'alias', None)
+    _local.alias = None
+    try:
+        yield
+    finally:
+        _local.alias = alias
+
+
+class ReplicaRouter:
+    """Чтение в реплику, выбранную ReplicaMiddleware для запроса.
+
+    Вне такого запроса (изменяющие запросы, команды, фоновые задачи)
+    чтение, как и запись, идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(_local, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        # Объект, прочитанный из реплики, сохраняется в default.
+        instance = hints.get('instance')
+        if (instance is not None
+                and instance._state.db in settings.DATABASE_REPLICAS):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # В репликах те же данные, что и в default.
+        return True
+
+
+class ReplicaMiddleware:
+    """Направляет чтение GET, HEAD и OPTIONS в реплики DATABASE_REPLICAS.
+
+    После изменяющего запроса клиент REPLICA_PIN_SECONDS секунд читает
+    из default и видит свои изменения, пока реплики догоняют. Если все
+    реплики недоступны, запрос читает из default.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = pin_key(request)
+        if request.method not in SAFE_METHODS:
+            if settings.REPLICA_PIN_SECONDS:
+                cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+            return self.get_response(request)
+        if not cache.get(key):
+            _local.alias = pick_replica()
+        try:
+            return self.get_response(request)
+        finally:
+            _local.alias = None
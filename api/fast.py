@@ -0,0 +1,169 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .metrics import current, timed
+
+# Значения этих полей из values() уже имеют нужный вид.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.ReadOnlyField,
+    serializers.SlugRelatedField,
+)
+
+_plans = {}
+
+
+def column(field, prefix=''):
+    if isinstance(field, serializers.SlugRelatedField):
+        return f'{prefix}{field.source}__{field.slug_field}'
+    if (isinstance(field, (serializers.RelatedField,
+                           serializers.ManyRelatedField,
+                           serializers.SerializerMethodField))
+            or field.source == '*'):
+        raise ImproperlyConfigured(
+            f'Поле {field.field_name} не поддерживается быстрым списком'
+        )
+    return prefix + field.source.replace('.', '__')
+
+
+def converter(field):
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    return field.to_representation
+
+
+def represent(row, fields):
+    item = {}
+    for name, path, convert in fields:
+        value = row[path]
+        item[name] = (
+            value if value is None or convert is None else convert(value)
+        )
+    return item
+
+
+class FastListPlan:
+    """Строит данные списка по values() без экземпляров моделей.
+
+    План составляется по полям сериализатора и даёт тот же JSON, что
+    serializer(many=True).data: простые поля и SlugRelatedField читаются
+    колонками одного запроса (связи — через JOIN), вложенный сериализатор
+    many=True — вторым запросом по id страницы. Значения проходят через
+    to_representation поля, если их нельзя отдать как есть.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        self.columns = ['pk']
+        self.fields = []
+        self.many = {}
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.ListSerializer):
+                self.add_many(field)
+            elif isinstance(field, serializers.BaseSerializer):
+                self.add_nested(field)
+            else:
+                path = column(field)
+                self.columns.append(path)
+                self.fields.append(
+                    (field.field_name, path, converter(field), None)
+                )
+
+    def add_nested(self, field):
+        prefix = field.source.replace('.', '__') + '__'
+        children = [
+            (child.field_name, column(child, prefix), converter(child))
+            for child in field._readable_fields
+        ]
+        self.columns.append(prefix + 'pk')
+        self.columns.extend(path for _, path, _ in children)
+        self.fields.append((field.field_name, prefix + 'pk', None, children))
+
+    def add_many(self, field):
+        relation = self.model._meta.get_field(field.source)
+        children = [
+            (child.field_name, column(child), converter(child))
+            for child in field.child._readable_fields
+        ]
+        self.many[field.field_name] = (
+            relation.related_model, relation.related_query_name(), children
+        )
+        self.fields.append((field.field_name, None, None, None))
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        related = {
+            name: self.fetch_many(rows, *plan)
+            for name, plan in self.many.items()
+        }
+        data = []
+        for row in rows:
+            item = {}
+            for name, path, convert, children in self.fields:
+                if path is None:
+                    item[name] = related[name].get(row['pk'], [])
+                    continue
+                value = row[path]
+                if value is None or (convert is None and children is None):
+                    item[name] = value
+                elif children is not None:
+                    item[name] = represent(row, children)
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+    def fetch_many(self, rows, model, query_name, children):
+        grouped = {}
+        if not rows:
+            return grouped
+        lookups = model.objects.filter(**{
+            f'{query_name}__in': [row['pk'] for row in rows]
+        }).values(query_name, *(path for _, path, _ in children))
+        for row in lookups:
+            grouped.setdefault(row[query_name], []).append(
+                represent(row, children)
+            )
+        return grouped
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        if serializer_class not in _plans:
+            _plans[serializer_class] = cls(serializer_class)
+        return _plans[serializer_class]
+
+
+class FastListMixin:
+    """Отдаёт list() через FastListPlan (настройка FAST_LIST_ENABLED).
+
+    Ставится ближе к ModelViewSet, чем кэши, чтобы они хранили уже
+    готовый ответ. Сериализатор списка должен обходиться полями, которые
+    понимает FastListPlan; совпадение JSON проверяют тесты.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_ENABLED:
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(self.fast_data(rows))
+        return self.get_paginated_response(self.fast_data(page))
+
+    def fast_rows(self, queryset):
+        plan = FastListPlan.for_serializer(self.get_serializer_class())
+        rows = plan.values(queryset)
+        # COUNT(*) пагинатора считаем без JOIN, которые добавил values().
+        rows.count = queryset.count
+        return rows
+
+    def fast_data(self, rows):
+        plan = FastListPlan.for_serializer(self.get_serializer_class())
+        if current() is not None:
+            return timed(plan.to_representation, 'serialize_time')(rows)
+        return plan.to_representation(rows)
@@ -2,6 +2,8 @@ import django_filters
 
 from reviews.models import Title
 
+from .search import search_titles
+
 
 class TitleFilter(django_filters.FilterSet):
     genre = django_filters.CharFilter(field_name='genre__slug')
@@ -9,7 +11,11 @@ class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(
         field_name='name', lookup_expr='icontains'
     )
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['name', 'year', 'genre', 'category']
+        fields = ['name', 'year', 'genre', 'category', 'search']
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
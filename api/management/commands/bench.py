@@ -0,0 +1,121 @@
+import json
+
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import modify_settings
+from django.test.testcases import LiveServerThread
+
+from api.benchmark import seed_from_csv, test_database
+from api.cache import get_cache
+from api.replay import (MIX_PATH, build_calls, compare_reports, read_mix,
+                        run_http, run_wsgi, summarize_samples,
+                        without_throttling)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет тестовую базу копиями static/data, проигрывает смесь '
+        'запросов и печатает rps, p50/p95/p99 и SQL-запросы по эндпоинтам. '
+        'Отчёт можно сохранить как базовый и сравнивать с ним.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=10,
+            help='Сколько копий CSV загрузить.',
+        )
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--mix', default=MIX_PATH)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--server', action='store_true',
+            help='Поднять тестовый HTTP-сервер и нагружать его по сети '
+                 'вместо вызова WSGI-обработчика в этом процессе.',
+        )
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--save', help='Сохранить отчёт в JSON.')
+        parser.add_argument('--compare', help='Базовый отчёт для сравнения.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Допустимый рост p95 относительно базового отчёта.',
+        )
+
+    def handle(self, *args, **options):
+        mix = read_mix(options['mix'])
+        with test_database(), without_throttling():
+            get_cache().clear()
+            seed_from_csv(options['scale'])
+            calls = build_calls(mix, options['requests'], options['seed'])
+            if options['server']:
+                samples, elapsed = self.run_server(calls, options)
+            else:
+                samples, elapsed = run_wsgi(calls)
+        report = summarize_samples(samples, elapsed)
+        self.print_report(report)
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as file:
+                json.dump({
+                    'options': {
+                        name: options[name] for name in (
+                            'scale', 'requests', 'seed', 'server',
+                            'concurrency',
+                        )
+                    },
+                    'endpoints': report,
+                }, file, ensure_ascii=False, indent=2)
+        if options['compare']:
+            self.compare(report, options)
+
+    def run_server(self, calls, options):
+        concurrency = options['concurrency']
+        overrides = {}
+        for conn in connections.all():
+            if conn.vendor == 'sqlite' and conn.is_in_memory_db():
+                # Базу в памяти видит только это соединение: отдаём его
+                # серверу и не нагружаем его параллельно.
+                conn.inc_thread_sharing()
+                overrides[conn.alias] = conn
+                concurrency = 1
+        server = LiveServerThread(
+            '127.0.0.1', StaticFilesHandler, connections_override=overrides
+        )
+        server.daemon = True
+        with modify_settings(ALLOWED_HOSTS={'append': '127.0.0.1'}):
+            server.start()
+            server.is_ready.wait()
+            if server.error:
+                raise server.error
+            try:
+                return run_http(
+                    calls, f'http://127.0.0.1:{server.port}', concurrency
+                )
+            finally:
+                server.terminate()
+                for conn in overrides.values():
+                    conn.dec_thread_sharing()
+
+    def print_report(self, report):
+        self.stdout.write(
+            f'{"endpoint":<10}{"count":>7}{"errors":>8}{"rps":>9}'
+            f'{"p50":>9}{"p95":>9}{"p99":>9}{"sql":>7}'
+        )
+        for endpoint, stats in report.items():
+            queries = stats['queries']
+            self.stdout.write(
+                f'{endpoint:<10}{stats["count"]:>7}{stats["errors"]:>8}'
+                f'{stats["rps"]:>9.1f}{stats["p50_ms"]:>9.2f}'
+                f'{stats["p95_ms"]:>9.2f}{stats["p99_ms"]:>9.2f}'
+                f'{"-" if queries is None else f"{queries:.1f}":>7}'
+            )
+
+    def compare(self, report, options):
+        with open(options['compare'], encoding='utf-8') as file:
+            baseline = json.load(file)['endpoints']
+        lines, regressions = compare_reports(
+            baseline, report, options['threshold']
+        )
+        for line in lines:
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError('Регрессии: ' + '; '.join(regressions))
@@ -0,0 +1,93 @@
+import itertools
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from api.authentication import get_access_token
+from api.benchmark import read_log, replay, seed_catalog, test_database
+from reviews.models import Review
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Проигрывает журнал запросов без ETag и с If-None-Match и '
+        'сравнивает объём ответов и процессорное время.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log', help='JSONL-журнал; по умолчанию опрос карточек, '
+                          'отзывов и комментариев с редкими записями.'
+        )
+        parser.add_argument('--titles', type=int, default=200)
+        parser.add_argument('--reviews', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--hot', type=int, default=20)
+        parser.add_argument(
+            '--write-every', type=int, default=50,
+            help='Каждый N-й запрос журнала добавляет комментарий.',
+        )
+
+    def handle(self, *args, **options):
+        with test_database():
+            seed_catalog(titles=options['titles'], reviews=options['reviews'])
+            if options['log']:
+                entries = read_log(options['log'])
+            else:
+                entries = self.polling_log(options)
+            client = APIClient()
+            user = User.objects.order_by('id').first()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+            )
+            results = {}
+            for mode, conditional in (('plain', False), ('etag', True)):
+                with transaction.atomic():
+                    results[mode] = replay(client, entries, conditional)
+                    transaction.set_rollback(True)
+        self.report(results)
+
+    def polling_log(self, options):
+        reviews = Review.objects.order_by('title_id', 'id')
+        first_reviews = {}
+        for title_id, review_id in reviews.values_list('title_id', 'id'):
+            first_reviews.setdefault(title_id, review_id)
+        hot = list(first_reviews.items())[:options['hot']]
+        paths = []
+        for title_id, review_id in hot:
+            base = f'/api/v1/titles/{title_id}/'
+            paths += [
+                base,
+                f'{base}reviews/',
+                f'{base}reviews/{review_id}/comments/',
+            ]
+        entries = []
+        polls = itertools.cycle(paths)
+        for number in range(1, options['requests'] + 1):
+            if options['write_every'] and number % options['write_every'] == 0:
+                title_id, review_id = hot[number % len(hot)]
+                entries.append({
+                    'method': 'POST',
+                    'path': f'/api/v1/titles/{title_id}/reviews/'
+                            f'{review_id}/comments/',
+                    'body': {'text': f'Комментарий {number}'},
+                })
+            else:
+                entries.append({'method': 'GET', 'path': next(polls)})
+        return entries
+
+    def report(self, results):
+        for mode, stats in results.items():
+            self.stdout.write(
+                f'{mode:>5}: 200={stats[200]} 304={stats[304]} '
+                f'записей={stats["writes"]} '
+                f'байт={stats["bytes"]} cpu={stats["cpu_ms"]:.0f}ms'
+            )
+        plain, etag = results['plain'], results['etag']
+        saved_bytes = 1 - etag['bytes'] / max(plain['bytes'], 1)
+        saved_cpu = 1 - etag['cpu_ms'] / max(plain['cpu_ms'], 1e-6)
+        self.stdout.write(
+            f'экономия: трафик {saved_bytes:.0%}, CPU {saved_cpu:.0%}'
+        )
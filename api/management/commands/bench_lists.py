@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.benchmark import measure, seed_catalog, summarize, test_database
+from api.views import ReviewViewSet, TitleViewSet
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает списки произведений и отзывов через ModelSerializer '
+        'и через быстрый путь по values() (FAST_LIST_ENABLED).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        items = options['items']
+        with test_database(), override_settings(CATALOG_CACHE_ENABLED=False):
+            seed_catalog(titles=items, reviews=items * items, genres=3)
+            title_id = Title.objects.values_list('id', flat=True).first()
+            requests = {
+                'titles': (
+                    TitleViewSet.as_view({'get': 'list'}),
+                    factory.get('/api/v1/titles/', {'limit': items}),
+                    {},
+                ),
+                'reviews': (
+                    ReviewViewSet.as_view({'get': 'list'}),
+                    factory.get(
+                        f'/api/v1/titles/{title_id}/reviews/',
+                        {'pagination': 'cursor', 'page_size': items},
+                    ),
+                    {'title_id': title_id},
+                ),
+            }
+            for name, (view, request, kwargs) in requests.items():
+                for fast in (False, True):
+                    with override_settings(FAST_LIST_ENABLED=fast):
+                        self.report(name, fast, view, request, kwargs,
+                                    options['repeat'])
+
+    def report(self, name, fast, view, request, kwargs, repeat):
+        def call():
+            view(request, **kwargs).render()
+        started = time.process_time()
+        stats = summarize(measure(call, repeat, warmup=0))
+        cpu = (time.process_time() - started) / repeat * 1000
+        self.stdout.write(
+            f'{name:>7} {"fast" if fast else "drf":>4}: '
+            f'cpu={cpu:.2f}ms p50={stats["p50_ms"]:.2f}ms '
+            f'p95={stats["p95_ms"]:.2f}ms'
+        )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.benchmark import measure, seed_catalog, summarize, test_database
+from api.views import TitleViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск произведений ?search= (полнотекстовый) '
+        'и ?name= (icontains) на каталогах разного размера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles', type=int, nargs='+', default=[1000, 10_000, 100_000]
+        )
+        parser.add_argument('--query', default='произведение 77')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = TitleViewSet.as_view({'get': 'list'})
+        query = options['query']
+        params = {
+            'search': {'search': query},
+            'icontains': {'name': query.split()[-1]},
+        }
+        for titles in options['titles']:
+            with test_database(), override_settings(
+                    CATALOG_CACHE_ENABLED=False):
+                seed_catalog(titles=titles)
+                for name, data in params.items():
+                    def request(data=data):
+                        view(factory.get('/api/v1/titles/', data)).render()
+                    stats = summarize(measure(request, options['repeat']))
+                    self.stdout.write(
+                        f'titles={titles:>7} {name:>9}: '
+                        f'p50={stats["p50_ms"]:.2f}ms '
+                        f'p95={stats["p95_ms"]:.2f}ms'
+                    )
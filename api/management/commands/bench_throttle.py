@@ -0,0 +1,68 @@
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import ScopedRateThrottle
+
+from api.throttling import ScopedBucketThrottle, load_store
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время проверки ограничения частоты на запрос: token '
+        'bucket в памяти процесса и в кэше против истории запросов DRF.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument(
+            '--rate', default='1000/min',
+            help='Ставка области bench; выше — длиннее история у DRF.',
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        requests = [
+            Request(factory.post(
+                '/api/v1/auth/token/',
+                REMOTE_ADDR=f'10.0.{number // 256}.{number % 256}',
+            ))
+            for number in range(options['clients'])
+        ]
+        view = SimpleNamespace(throttle_scope='bench')
+        rates = {'bench': options['rate']}
+        drf = ScopedRateThrottle()
+        drf.THROTTLE_RATES = rates
+        candidates = [
+            ('bucket local', ScopedBucketThrottle(),
+             'api.throttling.LocalBucketStore'),
+            ('bucket cache', ScopedBucketThrottle(),
+             'api.throttling.CacheBucketStore'),
+            ('drf history', drf, None),
+        ]
+        framework = {
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates
+        }
+        for name, throttle, store in candidates:
+            with override_settings(REST_FRAMEWORK=framework,
+                                   THROTTLE_STORE=store or ''):
+                load_store.cache_clear()
+                self.report(name, throttle, view, requests,
+                            options['requests'])
+
+    def report(self, name, throttle, view, requests, total):
+        allowed = 0
+        started = time.perf_counter()
+        for number in range(total):
+            request = requests[number % len(requests)]
+            allowed += throttle.allow_request(request, view)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{name:>12}: {elapsed / total * 1e6:.1f} мкс на запрос, '
+            f'пропущено {allowed} из {total}'
+        )
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.benchmark import measure, seed_catalog, summarize, test_database
+from api.views import TitleViewSet
+from reviews.models import Title
+
+
+class LegacyTitleViewSet(TitleViewSet):
+    queryset = Title.objects.all().annotate(
+        avg_rating=Avg('reviews__score')
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время ответа /api/v1/titles/ с хранимым рейтингом '
+        'и с вычислением Avg(reviews__score) на каждый запрос.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reviews', type=int, nargs='+',
+            default=[10_000, 100_000, 1_000_000],
+        )
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        views = {
+            'avg': LegacyTitleViewSet.as_view({'get': 'list'}),
+            'stored': TitleViewSet.as_view({'get': 'list'}),
+        }
+        for reviews in options['reviews']:
+            with test_database(), override_settings(
+                    CATALOG_CACHE_ENABLED=False):
+                seed_catalog(titles=options['titles'], reviews=reviews)
+                for name, view in views.items():
+                    def request(view=view):
+                        view(factory.get('/api/v1/titles/')).render()
+                    stats = summarize(measure(request, options['repeat']))
+                    self.stdout.write(
+                        f'reviews={reviews:>9} {name:>6}: '
+                        f'p50={stats["p50_ms"]:.2f}ms '
+                        f'p95={stats["p95_ms"]:.2f}ms'
+                    )
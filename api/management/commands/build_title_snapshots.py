@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.snapshots import snapshot_groups, store_group
+from api.views import TitleViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Заранее строит снимки первых страниц /api/v1/titles/ без фильтра '
+        'и с фильтрами category, genre и year.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', default='http://localhost',
+            help='Схема и хост для построения страниц, хост должен '
+                 'быть в ALLOWED_HOSTS.',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.TITLE_SNAPSHOT_ENABLED:
+            self.stdout.write('TITLE_SNAPSHOT_ENABLED выключен, пропуск')
+            return
+        started = time.monotonic()
+        page_size = TitleViewSet.pagination_class().default_limit
+        groups = pages = 0
+        for field, value in snapshot_groups():
+            pages += store_group(
+                TitleViewSet, field, value, page_size,
+                options['base_url'].rstrip('/'),
+            )
+            groups += 1
+        self.stdout.write(
+            f'Снимков: {pages} страниц в {groups} группах '
+            f'за {time.monotonic() - started:.1f} с'
+        )
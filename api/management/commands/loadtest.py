@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from api.benchmark import hold_slow_clients, run_load, summarize
+
+DEFAULT_PATHS = [
+    '/api/v1/titles/',
+    '/api/v1/genres/',
+    '/api/v1/categories/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест запущенного сервера: пропускная способность '
+        'и задержки. Например, сравнить DB_CONN_MAX_AGE=0 и 60 или '
+        'режимы WSGI и ASGI с медленными клиентами (--slow-clients).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*')
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--token', help='JWT для заголовка Authorization')
+        parser.add_argument(
+            '--slow-clients', type=int, default=0,
+            help='Сколько соединений медленно присылают заголовки.',
+        )
+        parser.add_argument('--slow-interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        urls = [
+            options['url'].rstrip('/') + path
+            for path in options['paths'] or DEFAULT_PATHS
+        ]
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Bearer {options["token"]}'
+        slow = None
+        if options['slow_clients']:
+            slow = hold_slow_clients(
+                options['url'], options['slow_clients'],
+                options['duration'], options['slow_interval'],
+            )
+        durations, errors, elapsed = run_load(
+            urls, options['concurrency'], options['duration'], headers
+        )
+        if slow is not None:
+            slow.join()
+        if not durations:
+            self.stderr.write(f'Нет успешных запросов, ошибок: {errors}')
+            return
+        stats = summarize(durations)
+        self.stdout.write(
+            f'{len(durations)} запросов за {elapsed:.1f}с '
+            f'({len(durations) / elapsed:.1f} rps), ошибок: {errors}\n'
+            f'p50={stats["p50_ms"]:.1f}ms p95={stats["p95_ms"]:.1f}ms '
+            f'p99={stats["p99_ms"]:.1f}ms'
+        )
@@ -0,0 +1,288 @@
+import threading
+from contextlib import ExitStack
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication
+from .cache import cache_stats
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_local = threading.local()
+
+
+def current():
+    """Метрики текущего запроса или None, если замер выключен."""
+    return getattr(_local, 'metrics', None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.view = 'unresolved'
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+
+    def execute(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.db_queries += 1
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;desc="{self.db_queries} queries";'
+            f'dur={self.db_time * 1000:.2f}',
+            f'serialize;dur={self.serialize_time * 1000:.2f}',
+            f'render;dur={self.render_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class ViewStats:
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+
+
+class MetricsRegistry:
+    """Агрегаты по представлениям в памяти процесса.
+
+    Каждый воркер gunicorn считает свои запросы, поэтому Prometheus
+    должен опрашивать воркеры по отдельности или суммировать их.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, method, status, metrics, total, size):
+        with self.lock:
+            stats = self.views.setdefault(
+                (metrics.view, method), ViewStats()
+            )
+            stats.duration.observe(total)
+            if size is not None:
+                stats.size.observe(size)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.db_queries += metrics.db_queries
+            stats.db_time += metrics.db_time
+            stats.serialize_time += metrics.serialize_time
+            stats.render_time += metrics.render_time
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+    def render(self):
+        lines = []
+        with self.lock:
+            views = sorted(self.views.items())
+            write_counter(lines, 'yamdb_requests_total', 'Число запросов.', [
+                (labels(key, status=status), count)
+                for key, stats in views
+                for status, count in sorted(stats.statuses.items())
+            ])
+            write_histogram(
+                lines, 'yamdb_request_duration_seconds',
+                'Время обработки запроса.',
+                [(key, stats.duration) for key, stats in views],
+            )
+            write_histogram(
+                lines, 'yamdb_response_size_bytes', 'Размер тела ответа.',
+                [(key, stats.size) for key, stats in views],
+            )
+            for name, attribute, help_text in (
+                ('yamdb_db_queries_total', 'db_queries', 'SQL-запросы.'),
+                ('yamdb_db_duration_seconds_total', 'db_time',
+                 'Время SQL-запросов.'),
+                ('yamdb_serialize_duration_seconds_total', 'serialize_time',
+                 'Время сериализаторов без SQL.'),
+                ('yamdb_render_duration_seconds_total', 'render_time',
+                 'Время рендеринга ответа.'),
+            ):
+                write_counter(lines, name, help_text, [
+                    (labels(key), getattr(stats, attribute))
+                    for key, stats in views
+                ])
+        stats = cache_stats()
+        write_counter(
+            lines, 'yamdb_catalog_cache_requests_total',
+            'Обращения к кэшу каталога.',
+            [(f'{{result="{name}"}}', stats[name]) for name in sorted(stats)]
+        )
+        return '\n'.join(lines) + '\n'
+
+
+def labels(key, **extra):
+    view, method = key
+    pairs = [('view', view), ('method', method)] + list(extra.items())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+def write_counter(lines, name, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for label_text, value in samples:
+        lines.append(f'{name}{label_text} {value}')
+
+
+def write_histogram(lines, name, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in samples:
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f'{name}_bucket{labels(key, le=bound)} {count}')
+        lines.append(
+            f'{name}_bucket{labels(key, le="+Inf")} {histogram.count}'
+        )
+        lines.append(f'{name}_sum{labels(key)} {histogram.sum}')
+        lines.append(f'{name}_count{labels(key)} {histogram.count}')
+
+
+registry = MetricsRegistry()
+
+
+def view_name(view_func, request):
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{cls.__name__}.{action}'
+
+
+class PerformanceMiddleware:
+    """Замеряет время, SQL, сериализацию и размер ответа по представлениям.
+
+    Включается настройкой PERFORMANCE_METRICS_ENABLED; выключенный
+    middleware Django исключает из цепочки при старте. Итоги запроса
+    уходят в заголовок Server-Timing и в registry для /metrics.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        _local.metrics = metrics
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.execute)
+                    )
+                response = self.get_response(request)
+        finally:
+            _local.metrics = None
+        total = perf_counter() - started
+        size = None if response.streaming else len(response.content)
+        registry.observe(
+            request.method, response.status_code, metrics, total, size
+        )
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing(total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current().view = view_name(view_func, request)
+
+
+def timed(func, attribute):
+    """Добавляет время вызова без SQL к атрибуту метрик запроса."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = current()
+        started = perf_counter()
+        db_time = metrics.db_time
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - started - (metrics.db_time - db_time)
+            setattr(metrics, attribute, getattr(metrics, attribute) + elapsed)
+    return wrapper
+
+
+class ViewTimingMixin:
+    """Считает время сериализаторов и рендерера представления."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if current() is not None:
+            serializer.to_representation = timed(
+                serializer.to_representation, 'serialize_time'
+            )
+        return serializer
+
+    def perform_content_negotiation(self, request, force=False):
+        renderer, media_type = super().perform_content_negotiation(
+            request, force
+        )
+        if current() is not None:
+            renderer.render = timed(renderer.render, 'render_time')
+        return renderer, media_type
+
+
+def is_admin_request(request):
+    """Администратор по JWT или сотрудник, вошедший в админку."""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    try:
+        auth = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return auth is not None and (auth[0].is_admin or auth[0].is_staff)
+
+
+def metrics_view(request):
+    """Метрики Prometheus: по PERFORMANCE_METRICS_TOKEN или администратору.
+
+    Без токена и без прав /metrics не открывается: по нему видно время
+    и SQL-запросы каждого представления.
+    """
+    if not settings.PERFORMANCE_METRICS_ENABLED:
+        raise Http404
+    token = settings.PERFORMANCE_METRICS_TOKEN
+    if not (
+        token and request.META.get('HTTP_AUTHORIZATION') == f'Bearer {token}'
+        or is_admin_request(request)
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
@@ -1,4 +1,10 @@
-from rest_framework import mixins, viewsets
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import (decorators, exceptions, mixins, response, status,
+                            viewsets)
+from rest_framework.settings import api_settings
+
+from .cache import invalidate
 
 
 class CreateDestroyListViewSet(mixins.CreateModelMixin,
@@ -6,3 +12,112 @@ class CreateDestroyListViewSet(mixins.CreateModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
     pass
+
+
+class QueryPlanMixin:
+    """Подгружает связи, которые читает сериализатор, одним запросом.
+
+    Сериализатор перечисляет их в Meta.select_related и
+    Meta.prefetch_related; план применяется и к списку, и к get_object().
+    """
+
+    def filter_queryset(self, queryset):
+        return self.plan_queryset(super().filter_queryset(queryset))
+
+    def plan_queryset(self, queryset, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        meta = getattr(serializer_class, 'Meta', None)
+        select_related = getattr(meta, 'select_related', ())
+        prefetch_related = getattr(meta, 'prefetch_related', ())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            return queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class NestedParentMixin:
+    """Родитель вложенного ресурса из URL, например отзыв для комментариев.
+
+    Родитель ищется в parent_queryset по parent_lookups (поле модели ->
+    аргумент URL), так что вся цепочка URL проверяется одним запросом.
+    Найденный родитель хранится на объекте запроса: его используют
+    get_queryset(), perform_create(), get_object() и проверка прав.
+    """
+    parent_field = None
+    parent_queryset = None
+    parent_lookups = {}
+
+    def get_parent_queryset(self):
+        return self.parent_queryset.filter(**{
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookups.items()
+        })
+
+    def get_parent(self):
+        if getattr(self.request, 'nested_parent', None) is None:
+            self.request.nested_parent = get_object_or_404(
+                self.get_parent_queryset()
+            )
+        return self.request.nested_parent
+
+    def get_object(self):
+        obj = super().get_object()
+        # Права и сериализатор обращаются к родителю без нового запроса.
+        setattr(obj, self.parent_field, self.get_parent())
+        return obj
+
+
+class BulkWriteMixin:
+    """Пакетное создание (POST) и обновление (PATCH) по адресу .../bulk/.
+
+    Тело запроса — массив объектов. Запись идёт одной транзакцией: если
+    хоть один объект не прошёл проверку, ничего не сохраняется, а ответ
+    содержит ошибки по позициям массива. bulk_create и bulk_update не
+    отправляют сигналы, поэтому версии кэша повышаются здесь.
+    """
+    bulk_serializer_class = None
+    bulk_max_items = 10000
+    bulk_cache_versions = ()
+
+    def get_serializer_class(self):
+        if self.action == 'bulk':
+            return self.bulk_serializer_class
+        return super().get_serializer_class()
+
+    @decorators.action(
+        detail=False, methods=['POST', 'PATCH'], url_path='bulk'
+    )
+    def bulk(self, request, *args, **kwargs):
+        created = request.method == 'POST'
+        if (isinstance(request.data, list)
+                and len(request.data) > self.bulk_max_items):
+            raise exceptions.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Не больше {self.bulk_max_items} объектов за запрос.'
+                ]
+            })
+        serializer = self.get_serializer(
+            None if created else self.get_queryset(),
+            data=request.data,
+            many=True,
+            partial=not created,
+            allow_empty=False,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objects = self.perform_bulk_save(serializer)
+        self.bulk_invalidate(objects, created)
+        return response.Response(
+            self.get_bulk_response_data(objects),
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+    def perform_bulk_save(self, serializer):
+        return serializer.save()
+
+    def bulk_invalidate(self, objects, created):
+        invalidate(*self.bulk_cache_versions)
+
+    def get_bulk_response_data(self, objects):
+        return self.serializer_class(objects, many=True).data
@@ -0,0 +1,99 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, Cursor,
+                                       CursorPagination, PageNumberPagination)
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по паре (pub_date, id) без COUNT и OFFSET.
+
+    Позиция курсора — дата публикации и id последней записи страницы,
+    поэтому новые записи не сдвигают уже выданные страницы.
+    """
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(self.cursor.position, reverse)
+            )
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_position_filter(self, position, reverse):
+        try:
+            pub_date, pk = position.rsplit('|', 1)
+            pub_date, pk = parse_datetime(pub_date), int(pk)
+        except (AttributeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        if reverse:
+            return Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+        return Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            return f'{item["pub_date"].isoformat()}|{item["id"]}'
+        return f'{item.pub_date.isoformat()}|{item.id}'
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.get_position(self.page[-1])
+        return self.encode_cursor(Cursor(0, False, position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self.get_position(self.page[0])
+        return self.encode_cursor(Cursor(0, True, position))
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            request.query_params.get('pagination') == 'cursor'
+            or cls.cursor_query_param in request.query_params
+        )
+
+
+class FeedPagination(BasePagination):
+    """Постраничная пагинация по умолчанию, курсорная — по запросу.
+
+    Курсорный режим включается параметром ?pagination=cursor, дальше
+    клиент переходит по ссылкам next/previous с параметром cursor.
+    """
+    default_class = PageNumberPagination
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.is_requested(request):
+            self.paginator = self.keyset_class()
+        else:
+            self.paginator = self.default_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.default_class().get_paginated_response_schema(schema)
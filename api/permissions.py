@@ -13,7 +13,7 @@ class AdminOrReadOnly(permissions.BasePermission):
 class ReviewCommentPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return request.method in permissions.SAFE_METHODS or (
-            request.user == obj.author
+            request.user.pk == obj.author_id
             or request.user.is_admin
             or request.user.is_moderator
             or request.user.is_staff or request.user.is_superuser
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import re
+import threading
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import view_name
+
+logger = logging.getLogger('api.queries')
+
+IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+SKIP_FILES = (__file__, os.path.join(os.path.dirname(__file__), 'metrics.py'))
+
+_local = threading.local()
+
+
+class QueryWatchError(AssertionError):
+    """N+1 в строгом режиме (QUERY_WATCH_STRICT, включён в тестах)."""
+
+
+def query_shape(sql):
+    """SQL без значений: параметры и так отделены, схлопываем IN (...)."""
+    return IN_LIST.sub('(...)', sql)
+
+
+def find_frame():
+    """Ближайший к запросу кадр стека из кода проекта."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (filename.startswith(settings.BASE_DIR)
+                and 'site-packages' not in filename
+                and filename not in SKIP_FILES):
+            path = os.path.relpath(filename, settings.BASE_DIR)
+            return f'{path}:{frame.lineno} in {frame.name}'
+    return None
+
+
+def report(kind, event):
+    event = dict(event, kind=kind)
+    logger.warning(
+        json.dumps(event, ensure_ascii=False, default=str),
+        extra={'query_event': event},
+    )
+
+
+class QueryWatch:
+    """Следит за SQL одного запроса: медленные запросы и повторы формы.
+
+    Медленный запрос (дольше SLOW_QUERY_THRESHOLD_MS) пишется в лог сразу.
+    Форма, повторившаяся N_PLUS_ONE_THRESHOLD раз и больше, — признак
+    N+1; о ней сообщается в конце запроса, в строгом режиме — исключением.
+    """
+
+    def __init__(self, view=None):
+        self.view = view
+        self.shapes = Counter()
+        self.frames = {}
+        self.slow_ms = settings.SLOW_QUERY_THRESHOLD_MS
+        self.repeat_limit = settings.N_PLUS_ONE_THRESHOLD
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (perf_counter() - started) * 1000
+            shape = query_shape(sql)
+            self.shapes[shape] += 1
+            if self.shapes[shape] == self.repeat_limit:
+                self.frames[shape] = find_frame()
+            if self.slow_ms and duration_ms >= self.slow_ms:
+                report('slow_query', {
+                    'view': self.view,
+                    'duration_ms': round(duration_ms, 2),
+                    'sql': sql,
+                    'frame': find_frame(),
+                })
+
+    def repeated(self):
+        return [
+            {'view': self.view, 'sql': shape, 'count': count,
+             'frame': self.frames.get(shape)}
+            for shape, count in self.shapes.items()
+            if count >= self.repeat_limit
+        ]
+
+    def finish(self):
+        problems = self.repeated()
+        for problem in problems:
+            report('n_plus_one', problem)
+        if problems and settings.QUERY_WATCH_STRICT:
+            raise QueryWatchError(
+                f'{self.view}: одинаковые SQL-запросы повторяются '
+                f'{problems[0]["count"]} раз: {problems[0]["sql"]} '
+                f'({problems[0]["frame"]})'
+            )
+
+
+@contextmanager
+def watch_queries(view=None):
+    watch = QueryWatch(view)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(watch))
+        yield watch
+    watch.finish()
+
+
+class QueryWatchMiddleware:
+    """Включает QueryWatch на время запроса (QUERY_WATCH_ENABLED)."""
+
+    def __init__(self, get_response):
+        if not settings.QUERY_WATCH_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with watch_queries(request.path) as watch:
+            _local.watch = watch
+            try:
+                return self.get_response(request)
+            finally:
+                _local.watch = None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _local.watch.view = view_name(view_func, request)
@@ -0,0 +1,234 @@
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from operator import attrgetter
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+
+from reviews.models import Genre, Review
+from users.models import User
+
+from .authentication import get_access_token
+from .benchmark import percentile, read_log
+
+MIX_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_requests.jsonl')
+
+Call = namedtuple('Call', 'endpoint name method path body headers')
+Sample = namedtuple('Sample', 'endpoint name status duration queries')
+
+
+def read_mix(path=MIX_PATH):
+    """Смесь запросов: JSONL со строками вида
+
+    {"endpoint": "titles", "name": "title-detail", "method": "GET",
+     "path": "/api/v1/titles/{title}/", "weight": 10, "auth": "user"}
+
+    В path и body подставляются {title}, {review}, {genre}, {username},
+    {confirmation_code} (код этого пользователя) и {n} — номер запроса.
+    """
+    return read_log(path)
+
+
+def fill(value, values):
+    if isinstance(value, str):
+        return value.format(**values)
+    if isinstance(value, dict):
+        return {key: fill(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, values) for item in value]
+    return value
+
+
+def build_calls(mix, count, seed=0):
+    """Разворачивает смесь в count конкретных запросов к текущей базе."""
+    rng = random.Random(seed)
+    reviews = list(Review.objects.order_by('id').values_list('title', 'id'))
+    genres = list(Genre.objects.order_by('id').values_list('slug', flat=True))
+    users = list(User.objects.filter(role=User.USER).order_by('id'))
+    admin = User.objects.filter(role=User.ADMIN).order_by('id').first()
+    tokens = {
+        'anon': None,
+        'user': get_access_token(users[0]),
+        'admin': get_access_token(admin),
+    }
+    weights = [entry.get('weight', 1) for entry in mix]
+    calls = []
+    for number, entry in enumerate(rng.choices(mix, weights, k=count)):
+        title, review = rng.choice(reviews)
+        user = rng.choice(users)
+        values = {
+            'title': title,
+            'review': review,
+            'genre': rng.choice(genres),
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+            'n': number,
+        }
+        headers = {}
+        token = tokens[entry.get('auth', 'anon')]
+        if token is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        calls.append(Call(
+            entry['endpoint'],
+            entry.get('name', entry['path']),
+            entry.get('method', 'GET').upper(),
+            fill(entry['path'], values),
+            fill(entry.get('body'), values),
+            headers,
+        ))
+    return calls
+
+
+def run_wsgi(calls):
+    """Выполняет запросы через WSGI-обработчик Django в этом процессе.
+
+    Так же, как тестовый клиент, проходит все middleware; для каждого
+    запроса считаются SQL-запросы.
+    """
+    from django.test import Client
+
+    client = Client()
+    samples = []
+    started = time.perf_counter()
+    for call in calls:
+        with CaptureQueriesContext(connection) as context:
+            begin = time.perf_counter()
+            response = client.generic(
+                call.method, call.path,
+                json.dumps(call.body) if call.body is not None else '',
+                content_type='application/json', **call.headers
+            )
+            duration = time.perf_counter() - begin
+        samples.append(Sample(
+            call.endpoint, call.name, response.status_code, duration,
+            len(context),
+        ))
+    return samples, time.perf_counter() - started
+
+
+def run_http(calls, base_url, concurrency=10):
+    """Выполняет запросы к запущенному серверу из concurrency потоков."""
+    import requests
+
+    samples = []
+    lock = threading.Lock()
+    queue = iter(calls)
+
+    def worker():
+        local = []
+        while True:
+            with lock:
+                call = next(queue, None)
+            if call is None:
+                break
+            # Без keep-alive: тестовый сервер Django на постоянном
+            # соединении добавляет к каждому ответу ~40 мс задержки ACK.
+            headers = {'Connection': 'close'}
+            if call.headers:
+                headers['Authorization'] = call.headers['HTTP_AUTHORIZATION']
+            begin = time.perf_counter()
+            try:
+                status = requests.request(
+                    call.method, base_url + call.path, json=call.body,
+                    headers=headers,
+                ).status_code
+            except requests.RequestException:
+                status = 0
+            local.append(Sample(
+                call.endpoint, call.name, status,
+                time.perf_counter() - begin, None,
+            ))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def without_throttling():
+    """Снимает ограничения частоты на время прогона.
+
+    Иначе смесь быстро упирается в лимит 'auth', и ответы 429 искажают
+    время и число SQL-запросов эндпоинтов.
+    """
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': dict.fromkeys(
+            api_settings.DEFAULT_THROTTLE_RATES
+        ),
+    })
+
+
+def summarize_samples(samples, elapsed):
+    """Статистика по эндпоинтам и итог: rps, перцентили, SQL-запросы.
+
+    Ошибкой считается любой ответ 4xx/5xx и обрыв соединения: смесь
+    состоит из корректных запросов.
+    """
+    report = {}
+    groups = itertools.groupby(
+        sorted(samples, key=attrgetter('endpoint')), attrgetter('endpoint')
+    )
+    for endpoint, group in itertools.chain(groups, [('total', samples)]):
+        group = list(group)
+        durations = [sample.duration for sample in group]
+        queries = [
+            sample.queries for sample in group if sample.queries is not None
+        ]
+        report[endpoint] = {
+            'count': len(group),
+            'errors': sum(
+                1 for sample in group
+                if not sample.status or sample.status >= 400
+            ),
+            'rps': len(group) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(durations, 0.50) * 1000,
+            'p95_ms': percentile(durations, 0.95) * 1000,
+            'p99_ms': percentile(durations, 0.99) * 1000,
+            'queries': sum(queries) / len(queries) if queries else None,
+        }
+    return report
+
+
+def compare_reports(baseline, current, threshold=0.2):
+    """Сравнивает отчёт с сохранённым базовым.
+
+    Возвращает строки сравнения и список регрессий: p95 вырос больше
+    чем на threshold или SQL-запросов на запрос стало больше.
+    """
+    lines = []
+    regressions = []
+    for endpoint, stats in current.items():
+        base = baseline.get(endpoint)
+        if base is None:
+            lines.append(f'{endpoint}: нет в базовом отчёте')
+            continue
+        change = 0.0
+        if base['p95_ms']:
+            change = stats['p95_ms'] / base['p95_ms'] - 1
+        line = (
+            f'{endpoint}: p95 {base["p95_ms"]:.1f} -> '
+            f'{stats["p95_ms"]:.1f}ms ({change:+.0%})'
+        )
+        if change > threshold:
+            regressions.append(f'{endpoint}: p95 {change:+.0%}')
+        if stats['queries'] is not None and base['queries'] is not None:
+            line += f', SQL {base["queries"]:.1f} -> {stats["queries"]:.1f}'
+            if stats['queries'] > base['queries'] + 1e-9:
+                regressions.append(f'{endpoint}: SQL-запросов больше')
+        lines.append(line)
+    return lines, regressions
@@ -0,0 +1,84 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, F, Func, IntegerField, Q, Value, When
+
+SEARCH_CONFIG = 'simple'
+TERM_RE = re.compile(r'\w+')
+
+
+def get_terms(query):
+    return TERM_RE.findall(query.casefold())[:10]
+
+
+def search_titles(queryset, query):
+    """Полнотекстовый поиск по названию и описанию с сортировкой по
+    релевантности.
+
+    В PostgreSQL используется to_tsvector/to_tsquery и GIN-индекс
+    reviews_title_search_idx из миграции; на остальных СУБД — поиск
+    подстрок по каждому слову с простым весом (совпадение в названии
+    важнее совпадения в описании).
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'postgresql':
+        return _postgres_search(queryset, terms)
+    return _fallback_search(queryset, terms)
+
+
+def _postgres_search(queryset, terms):
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector)
+
+    # Выражение должно совпадать с выражением индекса из миграции.
+    vector = SearchVector('name', 'description', config=SEARCH_CONFIG)
+    search_query = SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        config=SEARCH_CONFIG,
+        search_type='raw',
+    )
+    return queryset.annotate(
+        search_vector=vector,
+        search_rank=SearchRank(vector, search_query),
+    ).filter(search_vector=search_query).order_by('-search_rank', 'id')
+
+
+class CaseFold(Func):
+    """LOWER(), а в SQLite — Python-функция, понимающая не только ASCII."""
+    function = 'LOWER'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, function='PY_CASEFOLD', **extra_context
+        )
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(
+            'PY_CASEFOLD', 1,
+            lambda value: value.casefold() if value is not None else None,
+        )
+
+
+def _fallback_search(queryset, terms):
+    queryset = queryset.annotate(
+        search_name=CaseFold('name'),
+        search_description=CaseFold('description'),
+    )
+    rank = Value(0, output_field=IntegerField())
+    for term in terms:
+        in_name = {'search_name__contains': term}
+        in_description = {'search_description__contains': term}
+        queryset = queryset.filter(Q(**in_name) | Q(**in_description))
+        rank = rank + Case(
+            When(then=Value(2), **in_name),
+            When(then=Value(1), **in_description),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return queryset.annotate(search_rank=rank).order_by(
+        F('search_rank').desc(), 'id'
+    )
@@ -4,30 +4,26 @@ from django.shortcuts import get_object_or_404
 from rest_framework import serializers, validators
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.validators import title_year_validator
 from users.models import User
 
+from .bulk import BulkListSerializer
+
 
 class ReviewSerializer(serializers.ModelSerializer):
+    duplicate_message = 'Author review is alredy exist'
+
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
     )
     score = serializers.IntegerField()
 
-    def validate(self, attrs):
-        title = self.context['view'].kwargs.get('title_id')
-        author = self.context['request'].user.id
-        message = 'Author review is alredy exist'
-        if (not self.instance
-                and Review.objects.filter(
-                    title=title, author=author).exists()):
-            raise serializers.ValidationError(message)
-        return attrs
-
     class Meta:
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
         read_only_fileds = ('title', 'review')
+        select_related = ('author',)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -40,6 +36,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
         model = Comment
         read_only_fields = ('author', 'review')
+        select_related = ('author',)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -175,7 +172,12 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        exclude = ('author', )
+        exclude = (
+            'author', 'rating_sum', 'rating_count', 'version', 'modified',
+            'is_hidden',
+        )
+        select_related = ('category',)
+        prefetch_related = ('genre',)
 
 
 class TitleListSerializer(serializers.ModelSerializer):
@@ -190,8 +192,46 @@ class TitleListSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     year = serializers.IntegerField(required=True)
     category = CategorySerializer()
-    rating = serializers.IntegerField()
+    rating = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Title
+        exclude = (
+            'author', 'rating_sum', 'rating_count', 'version', 'modified',
+            'is_hidden',
+        )
+        select_related = ('category',)
+        prefetch_related = ('genre',)
+
+
+class GenreBulkSerializer(serializers.Serializer):
+    # При обновлении (PATCH) сериализатор частичный, и name можно опустить.
+    name = serializers.CharField(max_length=256)
+    slug = serializers.SlugField(max_length=50)
+
+    class Meta:
+        model = Genre
+        list_serializer_class = BulkListSerializer
+        lookup_field = 'slug'
+        unique_fields = ('slug',)
+
+
+class CategoryBulkSerializer(GenreBulkSerializer):
+
+    class Meta(GenreBulkSerializer.Meta):
+        model = Category
+
+
+class TitleBulkSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField()
+    year = serializers.IntegerField(validators=[title_year_validator])
+    description = serializers.CharField(required=False, allow_blank=True)
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
 
     class Meta:
         model = Title
-        exclude = ('author', )
+        list_serializer_class = BulkListSerializer
+        lookup_field = 'id'
+        related_fields = {'genre': Genre, 'category': Category}
@@ -0,0 +1,121 @@
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from reviews.deletion import review_hidden, title_hidden
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from .authentication import invalidate_cached_user
+from .cache import invalidate_on_commit
+from .db import check_connections
+from .search import register_sqlite_functions
+from .snapshots import drop_title_groups
+
+connection_created.connect(register_sqlite_functions)
+request_started.connect(check_connections)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    invalidate_on_commit('titles', f'title:{instance.pk}')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    invalidate_on_commit('genres', 'titles', 'snapshots')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate_on_commit('categories', 'titles', 'snapshots')
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    invalidate_on_commit('titles', f'title:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_on_commit('titles', f'title:{instance.pk}')
+    elif pk_set is None:
+        # У жанра очистили все произведения: id неизвестны, поэтому
+        # сбрасываем версию жанров, от которой зависят все карточки.
+        invalidate_on_commit('titles', 'genres')
+    else:
+        invalidate_on_commit('titles', *(f'title:{pk}' for pk in pk_set))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    invalidate_on_commit('titles', f'title:{instance.title_id}')
+
+
+# Снимки списка произведений сбрасываются по группам (без фильтра, год,
+# категория, жанр). Группы берутся из базы до изменения и после него:
+# произведение могло перейти в другую категорию или сменить жанры.
+
+@receiver(pre_save, sender=Title)
+def title_snapshots_before_save(sender, instance, raw, **kwargs):
+    if not raw and instance.pk is not None:
+        drop_title_groups(pk=instance.pk)
+
+
+@receiver(post_save, sender=Title)
+@receiver(pre_delete, sender=Title)
+def title_snapshots_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        drop_title_groups(pk=instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(pre_delete, sender=GenreTitle)
+def genre_title_snapshots_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        drop_title_groups(pk=instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_snapshots_changed(sender, instance, action, reverse,
+                                   pk_set, **kwargs):
+    if action not in ('pre_clear', 'pre_remove', 'post_add'):
+        return
+    if not reverse:
+        drop_title_groups(pk=instance.pk)
+    elif action == 'pre_clear':
+        drop_title_groups(genre=instance)
+    else:
+        drop_title_groups(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_snapshots_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        drop_title_groups(pk=instance.title_id)
+
+
+@receiver(title_hidden)
+@receiver(review_hidden)
+def hidden(sender, title_id, **kwargs):
+    invalidate_on_commit('titles', f'title:{title_id}')
+    drop_title_groups(pk=title_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
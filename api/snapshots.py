@@ -0,0 +1,171 @@
+import json
+import re
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.test import APIRequestFactory
+
+from reviews.models import Category, Genre, Title
+
+from .cache import get_cache, get_versions, invalidate_on_commit
+from .db import read_from_primary
+
+SNAPSHOT_KEY = 'catalog:snapshot:{}:{}:{}:{}'
+SNAPSHOT_FIELDS = ('category', 'genre', 'year')
+# Ссылки next/previous в снимке строятся от этого адреса и при выдаче
+# заменяются на адрес из запроса клиента.
+SNAPSHOT_BASE = 'http://snapshot.invalid'
+TITLES_PATH = '/api/v1/titles/'
+SLUG = re.compile(r'^[-a-zA-Z0-9_]+$')
+
+
+def group_name(field, value):
+    return f'snapshot:{field}:{value}'
+
+
+def snapshot_params(query_params, page_size):
+    """(field, value, page) для запроса, который отдаётся из снимка.
+
+    Снимки есть у первых TITLE_SNAPSHOT_PAGES страниц размера page_size
+    без фильтра или с одним фильтром category, genre или year.
+    """
+    params = {}
+    for name, values in query_params.lists():
+        if len(values) != 1:
+            return None
+        params[name] = values[0]
+    limit = params.pop('limit', str(page_size))
+    offset = params.pop('offset', '0')
+    if not limit.isdigit() or int(limit) != page_size or not offset.isdigit():
+        return None
+    page, rest = divmod(int(offset), page_size)
+    if rest or page >= settings.TITLE_SNAPSHOT_PAGES or len(params) > 1:
+        return None
+    if not params:
+        return '', '', page
+    (field, value), = params.items()
+    if field not in SNAPSHOT_FIELDS or not SLUG.match(value):
+        return None
+    # year=02000 отфильтрует те же строки, но попадёт в ссылки ответа.
+    if field == 'year' and (not value.isdigit() or str(int(value)) != value):
+        return None
+    return field, value, page
+
+
+def snapshot_key(field, value, page):
+    versions = get_versions(['snapshots', group_name(field, value)])
+    return SNAPSHOT_KEY.format(
+        field or '-', value or '-', page, '.'.join(map(str, versions))
+    )
+
+
+def build_page(view_class, field, value, page, page_size, base):
+    """Тело страницы списка, как его отдал бы view_class анониму.
+
+    Страница строится для адреса base (схема и хост, допустимый по
+    ALLOWED_HOSTS), а в ссылках next/previous он заменяется на
+    SNAPSHOT_BASE.
+    """
+    params = {field: value} if field else {}
+    if page:
+        params.update(limit=page_size, offset=page * page_size)
+    scheme, host = base.split('://', 1)
+    request = APIRequestFactory().get(
+        TITLES_PATH, params, secure=scheme == 'https',
+        HTTP_ACCEPT='application/json', HTTP_HOST=host,
+    )
+    request.snapshot_build = True
+    with read_from_primary():
+        response = view_class.as_view({'get': 'list'})(request)
+    if response.status_code != 200:
+        return None
+    response.render()
+    return response.content.replace(base.encode(), SNAPSHOT_BASE.encode())
+
+
+def store_group(view_class, field, value, page_size, base):
+    """Строит и сохраняет страницы одной группы, пока есть next."""
+    pages = 0
+    for page in range(settings.TITLE_SNAPSHOT_PAGES):
+        key = snapshot_key(field, value, page)
+        body = build_page(view_class, field, value, page, page_size, base)
+        if body is None:
+            break
+        get_cache().set(key, body, settings.TITLE_SNAPSHOT_TIMEOUT)
+        pages += 1
+        if json.loads(body)['next'] is None:
+            break
+    return pages
+
+
+def snapshot_groups():
+    yield '', ''
+    for slug in Category.objects.values_list('slug', flat=True):
+        yield 'category', slug
+    for slug in Genre.objects.values_list('slug', flat=True):
+        yield 'genre', slug
+    years = Title.objects.values_list('year', flat=True).distinct()
+    for year in years.order_by('year'):
+        yield 'year', str(year)
+
+
+def drop_title_groups(**filters):
+    """Сбрасывает снимки всех групп, в которые входят произведения.
+
+    Группы читаются сразу (до изменения их ещё видно в базе), а версии
+    сбрасываются после COMMIT.
+    """
+    if not settings.TITLE_SNAPSHOT_ENABLED:
+        return
+    names = {group_name('', '')}
+    # Скрытое произведение ещё числится в своих группах.
+    rows = Title.all_objects.filter(**filters).values_list(
+        'year', 'category__slug', 'genre__slug'
+    )
+    for year, category, genre in rows:
+        names.add(group_name('year', year))
+        if category is not None:
+            names.add(group_name('category', category))
+        if genre is not None:
+            names.add(group_name('genre', genre))
+    invalidate_on_commit(*names)
+
+
+class TitleSnapshotMixin:
+    """Отдаёт анонимам готовый JSON популярных страниц списка.
+
+    Тело страницы хранится в кэше каталога целиком, и попадание не
+    обращается к базе. Ключ включает версию группы (страницы без фильтра
+    или с одним фильтром): api.signals сбрасывают только группы
+    изменённых произведений, а правка жанров и категорий — все снимки.
+    Промах строит страницу заново; команда build_title_snapshots
+    заполняет снимки заранее.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if (not settings.TITLE_SNAPSHOT_ENABLED
+                or getattr(request, 'snapshot_build', False)
+                or request.user.is_authenticated
+                or getattr(request.accepted_renderer, 'format', None)
+                != 'json'):
+            return super().list(request, *args, **kwargs)
+        page_size = self.paginator.default_limit
+        found = snapshot_params(request.query_params, page_size)
+        if found is None:
+            return super().list(request, *args, **kwargs)
+        key = snapshot_key(*found)
+        base = request.build_absolute_uri('/')[:-1]
+        body = get_cache().get(key)
+        state = 'HIT'
+        if body is None:
+            body = build_page(type(self), *found, page_size, base)
+            if body is None:
+                return super().list(request, *args, **kwargs)
+            get_cache().set(key, body, settings.TITLE_SNAPSHOT_TIMEOUT)
+            state = 'MISS'
+        response = HttpResponse(
+            body.replace(SNAPSHOT_BASE.encode(), base.encode()),
+            content_type=request.accepted_media_type,
+        )
+        response['X-Snapshot'] = state
+        return response
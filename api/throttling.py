@@ -0,0 +1,136 @@
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def take_token(state, capacity, rate, now):
+    """Берёт токен из корзины state = (токены, время) или None (полная).
+
+    Возвращает новое состояние и сколько секунд ждать, если токена нет.
+    Отказ токен не расходует.
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens, updated = state
+        tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class LocalBucketStore:
+    """Корзины в памяти процесса: для тестов и одного воркера.
+
+    Хранит не больше max_keys последних ключей; вытесненный ключ
+    начинает с полной корзины.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+        self.max_keys = max_keys
+
+    def take(self, key, capacity, rate, now):
+        with self.lock:
+            state, wait = take_token(
+                self.buckets.pop(key, None), capacity, rate, now
+            )
+            self.buckets[key] = state
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return wait
+
+
+class CacheBucketStore:
+    """Корзины в кэше THROTTLE_CACHE_ALIAS, общие для воркеров.
+
+    Чтение и запись не атомарны: одновременные запросы с одним ключом
+    из разных воркеров могут пройти сверх лимита, но не больше чем по
+    одному на воркер.
+    """
+
+    def take(self, key, capacity, rate, now):
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        state, wait = take_token(cache.get(key), capacity, rate, now)
+        # За capacity / rate секунд корзина наполняется, ключ не нужен.
+        cache.set(key, state, math.ceil(capacity / rate))
+        return wait
+
+
+@lru_cache()
+def load_store(path):
+    return import_string(path)()
+
+
+def get_store():
+    return load_store(settings.THROTTLE_STORE)
+
+
+class BucketThrottle(SimpleRateThrottle):
+    """Token bucket вместо истории запросов SimpleRateThrottle.
+
+    Ставка 'N/период' даёт корзину на N запросов подряд, которая
+    пополняется на N токенов за период. Проверка — одно обращение к
+    хранилищу THROTTLE_STORE. Счётчик ведётся на пользователя, а для
+    анонимов — на IP (с учётом NUM_PROXIES).
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_rate(self):
+        # Ставки читаются при каждой проверке, а не при импорте, чтобы
+        # их можно было менять через override_settings.
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        return super().get_rate()
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.wait_time = get_store().take(
+            self.get_cache_key(request, view),
+            self.num_requests,
+            self.num_requests / self.duration,
+            self.timer(),
+        )
+        return not self.wait_time
+
+    def wait(self):
+        return math.ceil(self.wait_time)
+
+
+class ScopedBucketThrottle(BucketThrottle):
+    """Область ограничения задаёт throttle_scope представления.
+
+    У представлений без throttle_scope ограничиваются только изменяющие
+    запросы — областью 'write'.
+    """
+    default_scope = 'write'
+
+    def __init__(self):
+        # Как в ScopedRateThrottle: ставка известна только по представлению.
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, 'throttle_scope', None)
+        if self.scope is None:
+            if request.method in SAFE_METHODS:
+                return True
+            self.scope = self.default_scope
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
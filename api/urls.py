@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserGetTokenViewSet,
-                    UserSignupViewSet, UserViewSet)
+from .views import (CategoryViewSet, CommentViewSet, DataExportView,
+                    GenreViewSet, ReviewViewSet, TitleViewSet,
+                    UserGetTokenViewSet, UserSignupViewSet, UserViewSet)
 
 router = DefaultRouter()
 router.register(r'^users', UserViewSet, basename='users')
@@ -23,4 +23,7 @@ urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/token/', UserGetTokenViewSet.as_view(), name='token'),
     path('v1/auth/signup/', UserSignupViewSet.as_view(), name='signup'),
+    path(
+        'v1/export/<slug:dataset>/', DataExportView.as_view(), name='export'
+    ),
 ]
@@ -1,30 +1,44 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import EmailMessage, get_connection
-from django.db.models import Avg
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import (decorators, filters, generics, permissions,
-                            response, status, viewsets)
-from rest_framework.pagination import (LimitOffsetPagination,
-                                       PageNumberPagination)
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework import (decorators, exceptions, filters, generics,
+                            permissions, response, serializers, status, views,
+                            viewsets)
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.settings import api_settings
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.csv_data import DATASETS, RENDERERS, chunked, get_dataset
+from reviews.deletion import hide_review, hide_title
+from reviews.models import Category, Genre, Review, ScoreCount, Title
+from reviews.versions import touch_titles
 from users.models import User
+from users.outbox import enqueue_email
 
+from .authentication import get_access_token
+from .bulk import BATCH_SIZE
+from .cache import CachedRetrieveMixin, CatalogCacheMixin, invalidate
+from .conditional import ConditionalGetMixin
+from .fast import FastListMixin
 from .filters import TitleFilter
-from .mixins import CreateDestroyListViewSet
+from .metrics import ViewTimingMixin
+from .mixins import (BulkWriteMixin, CreateDestroyListViewSet,
+                     NestedParentMixin, QueryPlanMixin)
+from .pagination import FeedPagination
 from .permissions import (AdminOrReadOnly, IsAdmin, ReviewCommentPermission,
                           Signup)
-from .serializers import (CategorySerializer, CommentSerializer,
+from .serializers import (CategoryBulkSerializer, CategorySerializer,
+                          CommentSerializer, GenreBulkSerializer,
                           GenreSerializer, ReviewSerializer,
-                          TitleListSerializer, TitleSerializer,
-                          UserGetTokenSerializer, UserSerializer,
-                          UserSignupSerializer)
+                          TitleBulkSerializer, TitleListSerializer,
+                          TitleSerializer, UserGetTokenSerializer,
+                          UserSerializer, UserSignupSerializer)
+from .snapshots import TitleSnapshotMixin
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ViewTimingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('id')
     serializer_class = UserSerializer
     lookup_field = 'username'
@@ -38,7 +52,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.IsAuthenticated, ]
     )
     def me(self, request):
-        user = self.request.user
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
             serializer = self.get_serializer(instance=user)
             return response.Response(
@@ -51,7 +65,8 @@ class UserViewSet(viewsets.ModelViewSet):
         return response.Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserSignupViewSet(generics.CreateAPIView):
+class UserSignupViewSet(ViewTimingMixin, generics.CreateAPIView):
+    throttle_scope = 'auth'
     serializer_class = UserSignupSerializer
     permission_classes = [Signup]
 
@@ -64,26 +79,20 @@ class UserSignupViewSet(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
-        user = get_object_or_404(
-            User,
-            username=serializer.validated_data['username']
+        token = default_token_generator.make_token(serializer.instance)
+        enqueue_email(
+            'Получение JWT-токена',
+            f'Ваш код подтверждения: {token}',
+            serializer.validated_data['email'],
         )
-        token = default_token_generator.make_token(user)
-        email = serializer.validated_data['email']
-        with get_connection() as connection:
-            EmailMessage(
-                'Получение JWT-токена',
-                f'Ваш код подтверждения: {token}',
-                settings.EMAIL_HOST_USER,
-                [email, ],
-                connection=connection
-            ).send()
         return response.Response(
             serializer.data, status=status.HTTP_200_OK, headers=headers
         )
 
 
-class UserGetTokenViewSet(generics.CreateAPIView):
+class UserGetTokenViewSet(ViewTimingMixin,
+                          generics.CreateAPIView):
+    throttle_scope = 'auth'
     serializer_class = UserGetTokenSerializer
     permission_classes = [Signup]
 
@@ -98,83 +107,245 @@ class UserGetTokenViewSet(generics.CreateAPIView):
                 User,
                 username=serializer.validated_data['username']
             )
-            refresh = RefreshToken.for_user(user)
-            data = {'token': str(refresh.access_token)}
+            data = {'token': str(get_access_token(user))}
             return response.Response(data, status=status.HTTP_201_CREATED)
         return response.Response(
             serializer.errors, status=status.HTTP_400_BAD_REQUEST
         )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score'))
+class TitleViewSet(ViewTimingMixin, ConditionalGetMixin, TitleSnapshotMixin,
+                   CachedRetrieveMixin, BulkWriteMixin, FastListMixin,
+                   QueryPlanMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.all()
     serializer_class = TitleSerializer
     permission_classes = (AdminOrReadOnly,)
     pagination_class = LimitOffsetPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cache_resource = 'titles'
+    cache_query_params = ('limit', 'offset', *TitleFilter.Meta.fields)
+    bulk_serializer_class = TitleBulkSerializer
+
+    def get_cache_versions(self):
+        if self.action == 'retrieve':
+            return [f'title:{self.kwargs["pk"]}', 'genres', 'categories']
+        return super().get_cache_versions()
+
+    def get_version(self):
+        if self.action != 'retrieve':
+            return None
+        try:
+            return Title.objects.filter(pk=self.kwargs['pk']).values_list(
+                'version', 'modified'
+            ).first()
+        except ValueError:
+            return None
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def perform_destroy(self, instance):
+        hide_title(instance)
+
+    def perform_bulk_save(self, serializer):
+        if serializer.instance is None:
+            return serializer.save(author=self.request.user)
+        return serializer.save()
+
+    def bulk_invalidate(self, objects, created):
+        if created:
+            invalidate('titles', 'snapshots')
+            return
+        ids = [obj.pk for obj in objects]
+        invalidate('titles', 'snapshots', *(f'title:{pk}' for pk in ids))
+        for chunk in chunked(ids, BATCH_SIZE):
+            touch_titles(pk__in=chunk)
+
+    def get_bulk_response_data(self, objects):
+        titles = self.plan_queryset(
+            Title.objects.all(), TitleSerializer
+        ).in_bulk([obj.pk for obj in objects])
+        return TitleSerializer(
+            [titles[obj.pk] for obj in objects], many=True
+        ).data
+
+    @decorators.action(detail=False, url_path='top')
+    def top(self, request):
+        return self.cached_response(self.top_response, request)
+
+    def top_response(self, request):
+        # Рейтинг и число отзывов хранятся в Title и обновляются вместе
+        # с отзывами, поэтому рейтинг читается по индексу без отзывов.
+        limit = request.query_params.get('limit', '')
+        limit = min(
+            int(limit) if limit.isdigit() and int(limit) > 0
+            else settings.TOP_TITLES_LIMIT,
+            settings.TOP_TITLES_MAX_LIMIT,
+        )
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            rating_count__gte=settings.TOP_TITLES_MIN_REVIEWS
+        ).order_by('-rating', '-rating_count', 'id')
+        if settings.FAST_LIST_ENABLED:
+            return response.Response(
+                self.fast_data(self.fast_rows(queryset)[:limit])
+            )
+        return response.Response(
+            self.get_serializer(queryset[:limit], many=True).data
+        )
+
+    @decorators.action(detail=True, url_path='rating-histogram')
+    def rating_histogram(self, request, pk=None):
+        if not pk.isdigit():
+            raise exceptions.NotFound
+        counts = dict(
+            ScoreCount.objects.filter(
+                title_id=pk, title__is_hidden=False
+            ).values_list(
+                'score', 'count'
+            )
+        )
+        if not counts and not Title.objects.filter(pk=pk).exists():
+            raise exceptions.NotFound
+        return response.Response({
+            'count': sum(counts.values()),
+            'histogram': {
+                str(score): counts.get(score, 0) for score in range(1, 11)
+            },
+        })
+
     def get_serializer_class(self):
-        if self.action == 'list' or self.action == 'retrieve':
+        if self.action in ('list', 'retrieve', 'top'):
             return TitleListSerializer
+        if self.action == 'bulk':
+            return super().get_serializer_class()
         return TitleSerializer
 
 
-class GenreViewSet(CreateDestroyListViewSet):
+class GenreViewSet(ViewTimingMixin, CatalogCacheMixin, BulkWriteMixin,
+                   CreateDestroyListViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
+    bulk_cache_versions = ('genres', 'titles', 'snapshots')
     lookup_field = 'slug'
     permission_classes = (AdminOrReadOnly,)
     pagination_class = LimitOffsetPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    cache_resource = 'genres'
+    cache_query_params = ('limit', 'offset', 'search')
+
+    def bulk_invalidate(self, objects, created):
+        super().bulk_invalidate(objects, created)
+        if not created:
+            touch_titles(genre__in=objects)
 
 
-class CategoryViewSet(CreateDestroyListViewSet):
+class CategoryViewSet(ViewTimingMixin, CatalogCacheMixin,
+                      BulkWriteMixin, CreateDestroyListViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
+    bulk_cache_versions = ('categories', 'titles', 'snapshots')
     lookup_field = 'slug'
     permission_classes = (AdminOrReadOnly,)
     pagination_class = LimitOffsetPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    cache_resource = 'categories'
+    cache_query_params = ('limit', 'offset', 'search')
 
+    def bulk_invalidate(self, objects, created):
+        super().bulk_invalidate(objects, created)
+        if not created:
+            touch_titles(category__in=objects)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(ViewTimingMixin, ConditionalGetMixin, NestedParentMixin,
+                    FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [
         ReviewCommentPermission, permissions.IsAuthenticatedOrReadOnly
     ]
-    pagination_class = PageNumberPagination
+    pagination_class = FeedPagination
+    parent_field = 'title'
+    parent_queryset = Title.objects.all()
+    parent_lookups = {'pk': 'title_id'}
+
+    def get_version(self):
+        title = self.get_parent()
+        return title.version, title.modified
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        # new_queryset = title.reviews.all().order_by('-pub_date')
-        return title.reviews.all().order_by('-pub_date')
+        return self.get_parent().reviews.all().order_by('-pub_date')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        # Повторный отзыв отсекает ограничение unique_reviews_fields:
+        # Review.save() выполняется в транзакции, поэтому после ошибки
+        # соединение остаётся рабочим и отдельный запрос exists() не нужен.
+        try:
+            serializer.save(author=self.request.user, title=self.get_parent())
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializer.duplicate_message
+                ]
+            })
 
+    def perform_destroy(self, instance):
+        hide_review(instance)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ViewTimingMixin, ConditionalGetMixin, NestedParentMixin,
+                     FastListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [
         ReviewCommentPermission, permissions.IsAuthenticatedOrReadOnly
     ]
+    pagination_class = FeedPagination
+    parent_field = 'review'
+    # Отзыв ищется вместе с id произведения из URL: комментарии
+    # не отдаются по адресу чужого или скрытого произведения.
+    parent_queryset = Review.objects.select_related('title').filter(
+        title__is_hidden=False
+    )
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
+
+    def get_version(self):
+        title = self.get_parent().title
+        return title.version, title.modified
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        # new_queryset = review.comments.all().order_by('-pub_date')
-        return review.comments.all().order_by('-pub_date')
+        return self.get_parent().comments.all().order_by('-pub_date')
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        return serializer.save(author=self.request.user, review=review)
+        return serializer.save(
+            author=self.request.user, review=self.get_parent()
+        )
+
+
+class DataExportView(views.APIView):
+    permission_classes = [IsAdmin]
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson; charset=utf-8',
+    }
+
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise exceptions.NotFound(f'Неизвестный набор данных {dataset}')
+        output = request.query_params.get('output', 'csv')
+        if output not in RENDERERS:
+            raise exceptions.ValidationError(
+                {'output': f'Допустимые форматы: {", ".join(RENDERERS)}'}
+            )
+        columns, rows = get_dataset(dataset)
+        export = StreamingHttpResponse(
+            RENDERERS[output](columns, rows),
+            content_type=self.content_types[output],
+        )
+        export['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{output}"'
+        )
+        return export
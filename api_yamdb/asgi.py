@@ -1,7 +1,37 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.asgi import get_asgi_application
+from asgiref.wsgi import WsgiToAsgi
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+# В Django 2.2 нет асинхронных представлений, а ORM нельзя вызывать из
+# цикла событий. Поэтому цикл uvicorn принимает соединения, дочитывает
+# тело запроса и отдаёт ответ, а само приложение работает в пуле из
+# ASGI_THREADS потоков: медленный клиент не занимает поток, пока шлёт
+# запрос. Соединений с БД — не больше workers * ASGI_THREADS.
+django_application = WsgiToAsgi(get_wsgi_application())
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            asyncio.get_event_loop().set_default_executor(ThreadPoolExecutor(
+                max_workers=settings.ASGI_THREADS,
+                thread_name_prefix='django',
+            ))
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
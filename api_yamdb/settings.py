@@ -29,6 +29,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.PerformanceMiddleware',
+    'api.querywatch.QueryWatchMiddleware',
+    'api.db.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,8 +70,119 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='db_password'),
         'HOST': os.getenv('DB_HOST', default='127.0.0.1'),
         'PORT': os.getenv('DB_PORT', default='5432'),
+        # Постоянные соединения: каждый поток gunicorn держит своё
+        # соединение, всего их workers * threads.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # Для PgBouncer в режиме transaction серверные курсоры недоступны.
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', default='0') == '1'
+        ),
     }
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # Параметр libpq: другие драйверы его не принимают.
+    DATABASES['default']['OPTIONS'] = {
+        'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', default=5)),
+    }
+
+# Реплики только для чтения (api.db.ReplicaRouter): хосты из
+# DB_REPLICA_HOSTS через запятую, остальные параметры как у default.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(',')), 1
+):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+DATABASE_ROUTERS = ['api.db.ReplicaRouter']
+# Сколько секунд после изменяющего запроса клиент читает из default.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=5))
+# Через сколько секунд снова пробовать недоступную реплику.
+REPLICA_RETRY_SECONDS = int(os.getenv('REPLICA_RETRY_SECONDS', default=30))
+
+# Размер пула потоков для Django в режиме ASGI (api_yamdb.asgi).
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', default=10))
+
+# Проверять переиспользуемое соединение перед запросом и закрывать его,
+# если сервер БД его уже разорвал. Проверка — лишний SELECT 1, поэтому
+# каждое соединение проверяется не чаще раза в интервал (секунды).
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', default='1') == '1'
+DB_CONN_HEALTH_CHECK_INTERVAL = int(
+    os.getenv('DB_CONN_HEALTH_CHECK_INTERVAL', default=30)
+)
+
+CACHE_BACKEND = os.getenv(
+    'CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+# LocMemCache у каждого воркера свой: сброс версий, кэш ролей JWT,
+# счётчики ограничения частоты и привязка к default после записи
+# действуют только в воркере, который обработал запрос. В infra
+# CACHE_BACKEND указывает на общий memcached.
+CACHE_SHARED = not CACHE_BACKEND.endswith('.LocMemCache')
+
+# Кэш ответов каталога (/titles/, /genres/, /categories/). По умолчанию
+# включён только с общим кэшем: с локальным остальные воркеры отдавали
+# бы устаревшие ответы до CATALOG_CACHE_TIMEOUT.
+CATALOG_CACHE_ENABLED = os.getenv(
+    'CATALOG_CACHE_ENABLED', default='1' if CACHE_SHARED else '0'
+) == '1'
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', default=300))
+
+# Списки произведений, отзывов и комментариев строятся из values()
+# без ModelSerializer (api.fast); JSON тот же.
+FAST_LIST_ENABLED = os.getenv('FAST_LIST_ENABLED', default='1') == '1'
+
+# /titles/top/: произведения с не меньшим числом отзывов по убыванию рейтинга.
+TOP_TITLES_MIN_REVIEWS = int(os.getenv('TOP_TITLES_MIN_REVIEWS', default=3))
+TOP_TITLES_LIMIT = 10
+TOP_TITLES_MAX_LIMIT = 100
+
+# Готовый JSON первых страниц /titles/ для анонимов (api.snapshots),
+# хранится в том же кэше. Срок жизни страхует от изменений без сигналов.
+TITLE_SNAPSHOT_ENABLED = os.getenv('TITLE_SNAPSHOT_ENABLED', default='0') == '1'
+TITLE_SNAPSHOT_PAGES = int(os.getenv('TITLE_SNAPSHOT_PAGES', default=3))
+TITLE_SNAPSHOT_TIMEOUT = int(os.getenv('TITLE_SNAPSHOT_TIMEOUT', default=3600))
+
+# Замер времени, SQL и сериализации по представлениям: заголовок
+# Server-Timing и метрики Prometheus на /metrics (в памяти процесса).
+PERFORMANCE_METRICS_ENABLED = (
+    os.getenv('PERFORMANCE_METRICS_ENABLED', default='0') == '1'
+)
+PERFORMANCE_SERVER_TIMING = (
+    os.getenv('PERFORMANCE_SERVER_TIMING', default='1') == '1'
+)
+# /metrics открыт администраторам, а с токеном — ещё и запросам с
+# заголовком Authorization: Bearer <токен> (для Prometheus).
+PERFORMANCE_METRICS_TOKEN = os.getenv('PERFORMANCE_METRICS_TOKEN', default='')
+
+# Журнал медленных SQL и поиск N+1 (логгер api.queries, JSON в сообщении).
+QUERY_WATCH_ENABLED = os.getenv('QUERY_WATCH_ENABLED', default='0') == '1'
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', default=200))
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', default=5))
+# В строгом режиме N+1 превращается в исключение (для тестов).
+QUERY_WATCH_STRICT = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.queries': {'handlers': ['console'], 'level': 'WARNING'},
+        'api.db': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -114,15 +228,41 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
+    ],
+    # Token bucket (api.throttling): 'auth' — регистрация и получение
+    # токена, 'write' — изменяющие запросы остальных представлений.
+    # Пустое значение снимает ограничение.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.ScopedBucketThrottle',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': os.getenv('THROTTLE_AUTH_RATE', default='10/min') or None,
+        'write': os.getenv('THROTTLE_WRITE_RATE', default='120/min') or None,
+    },
+    # Сколько прокси перед приложением: IP клиента берётся из
+    # X-Forwarded-For, который выставляет nginx.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=0)),
 }
 
+# Хранилище счётчиков ограничения частоты. CacheBucketStore общий для
+# воркеров, только если CACHE_BACKEND общий (memcached, redis);
+# api.throttling.LocalBucketStore считает в памяти процесса.
+THROTTLE_STORE = os.getenv(
+    'THROTTLE_STORE', default='api.throttling.CacheBucketStore'
+)
+THROTTLE_CACHE_ALIAS = 'default'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=30),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд хранить в кэше роль пользователя для JWT-аутентификации.
+# 0 — доверять claims токена: ни одного запроса к базе, но смена роли
+# начнёт действовать только после выпуска нового токена.
+JWT_USER_CACHE_TIMEOUT = int(os.getenv('JWT_USER_CACHE_TIMEOUT', default=60))
+
 EMAIL_HOST_USER = os.getenv('USER_EMAIL')
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = 'C:/Dev/api_yamdb/api_yamdb/tmp'
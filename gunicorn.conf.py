@@ -0,0 +1,14 @@
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 3))
+# sync — по одному запросу на процесс; gthread — потоки внутри процесса.
+# Число соединений с БД = workers * threads.
+# uvicorn.workers.UvicornWorker — режим ASGI, приложение
+# api_yamdb.asgi:application (GUNICORN_APP), потоки задаёт ASGI_THREADS.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
@@ -0,0 +1,190 @@
+import csv
+import json
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from users.models import User
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'reviews', 'static', 'data')
+
+CsvTable = namedtuple('CsvTable', 'name filename model columns')
+
+# Порядок важен: таблицы идут после тех, на которые ссылаются.
+TABLES = [
+    CsvTable('users', 'users.csv', User, (
+        ('id', 'id'), ('username', 'username'), ('email', 'email'),
+        ('role', 'role'), ('bio', 'bio'), ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+    CsvTable('category', 'category.csv', Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    CsvTable('genre', 'genre.csv', Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    CsvTable('titles', 'titles.csv', Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'),
+    )),
+    CsvTable('genre_title', 'genre_title.csv', GenreTitle, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    CsvTable('review', 'review.csv', Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    CsvTable('comments', 'comments.csv', Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+]
+TABLES_BY_NAME = {table.name: table for table in TABLES}
+
+# Выгружаются только видимые строки и то, что ссылается на них: иначе
+# выгрузку нельзя загрузить обратно из-за внешних ключей.
+VISIBLE_ROWS = {
+    'titles': {'is_hidden': False},
+    'genre_title': {'title__is_hidden': False},
+    'review': {'is_hidden': False, 'title__is_hidden': False},
+    'comments': {
+        'review__is_hidden': False, 'review__title__is_hidden': False
+    },
+}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+@contextmanager
+def keep_auto_now(model):
+    """Не даёт auto_now_add перезаписать даты, взятые из файла."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_objects(table, path, defaults=None):
+    converters = []
+    for column, attname in table.columns:
+        field = table.model._meta.get_field(attname)
+        converters.append((column, attname, field))
+    with open(path, encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            values = dict(defaults or {})
+            for column, attname, field in converters:
+                value = row[column]
+                if value == '' and field.null:
+                    value = None
+                values[attname] = field.to_python(value)
+            if table.model is User:
+                values.setdefault('password', make_password(None))
+            yield table.model(**values)
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def format_value(value):
+    if value is None:
+        return ''
+    if not hasattr(value, 'isoformat'):
+        return value
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        return value[:-6] + 'Z'
+    return value
+
+
+def iter_table(table, chunk_size=2000):
+    attnames = [attname for _, attname in table.columns]
+    columns = [column for column, _ in table.columns]
+    rows = table.model._base_manager.filter(
+        **VISIBLE_ROWS.get(table.name, {})
+    ).order_by('pk').values_list(*attnames)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, map(format_value, row)))
+
+
+CATALOG_COLUMNS = (
+    'id', 'name', 'year', 'description', 'category', 'genre',
+    'rating', 'rating_count',
+)
+
+
+def iter_catalog(chunk_size=2000):
+    """Произведения с категорией, жанрами и рейтингом.
+
+    Жанры подгружаются отдельным запросом на каждую пачку произведений,
+    поэтому память не растёт с размером каталога.
+    """
+    titles = Title.objects.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'rating', 'rating_count',
+    )
+    for chunk in chunked(titles.iterator(chunk_size=chunk_size), chunk_size):
+        genres = {}
+        links = GenreTitle.objects.filter(
+            title_id__in=[row[0] for row in chunk]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug')
+        for title_id, slug in links:
+            genres.setdefault(title_id, []).append(slug)
+        for pk, name, year, description, category, rating, count in chunk:
+            yield {
+                'id': pk,
+                'name': name,
+                'year': year,
+                'description': description,
+                'category': category,
+                'genre': genres.get(pk, []),
+                'rating': rating,
+                'rating_count': count,
+            }
+
+
+def get_dataset(name, chunk_size=2000):
+    if name == 'catalog':
+        return CATALOG_COLUMNS, iter_catalog(chunk_size)
+    table = TABLES_BY_NAME[name]
+    columns = [column for column, _ in table.columns]
+    return columns, iter_table(table, chunk_size)
+
+
+def render_csv(columns, rows):
+    writer = csv.DictWriter(Echo(), fieldnames=columns)
+    yield writer.writeheader()
+    for row in rows:
+        if isinstance(row.get('genre'), list):
+            row = dict(row, genre=','.join(row['genre']))
+        yield writer.writerow(row)
+
+
+def render_ndjson(columns, rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=str) + '\n'
+
+
+RENDERERS = {'csv': render_csv, 'ndjson': render_ndjson}
+DATASETS = [table.name for table in TABLES] + ['catalog']
@@ -0,0 +1,111 @@
+import time
+
+from django.db import connections, router, transaction
+from django.dispatch import Signal
+
+from .models import Comment, GenreTitle, Review, ScoreCount, Title
+from .ratings import update_rating, update_scores
+
+# Отправляются после скрытия; api.signals сбрасывают по ним кэши.
+title_hidden = Signal(providing_args=['title_id'])
+review_hidden = Signal(providing_args=['title_id'])
+
+
+def hide_title(title):
+    """Скрывает произведение сразу; зависимые строки удалит purge_hidden."""
+    Title.objects.filter(pk=title.pk).update(is_hidden=True)
+    title_hidden.send(sender=Title, title_id=title.pk)
+
+
+def hide_review(review):
+    """Скрывает отзыв и сразу убирает его оценку из рейтинга."""
+    with transaction.atomic():
+        if not Review.objects.filter(pk=review.pk).update(is_hidden=True):
+            return
+        update_rating(review.title_id, -review.score, -1)
+        update_scores(review.title_id, review.score, -1)
+    review_hidden.send(sender=Review, title_id=review.title_id)
+
+
+class Throttle:
+    """Пауза после каждой пачки удаления.
+
+    Пауза не короче pause и не короче самой пачки: удаление занимает базу
+    не больше половины времени, блокировки короткие, а реплики успевают
+    догонять основную базу.
+    """
+
+    def __init__(self, pause):
+        self.pause = pause
+        self.started = time.monotonic()
+
+    def __call__(self):
+        elapsed = time.monotonic() - self.started
+        time.sleep(max(self.pause, elapsed))
+        self.started = time.monotonic()
+
+
+def delete_rows(model, field, values):
+    """DELETE по значениям поля одним запросом, без сигналов и каскада.
+
+    QuerySet.delete() здесь не годится: у моделей есть приёмники
+    pre_delete/post_delete, и Collector загружал бы каждую строку.
+    Зависимые строки вызывающий удаляет сам. Возвращает число строк.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    column = model._meta.get_field(field).column
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} '
+            f'WHERE {quote(column)} IN ({placeholders})',
+            list(values),
+        )
+        return cursor.rowcount
+
+
+def delete_in_batches(queryset, batch_size, throttle):
+    """Удаляет строки queryset пачками по id без сигналов и каскада.
+
+    Зависимые строки к этому моменту уже должны быть удалены.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += delete_rows(model, model._meta.pk.name, ids)
+        throttle()
+
+
+def purge_hidden(batch_size=1000, pause=0.1):
+    """Удаляет скрытые отзывы и произведения вместе с зависимыми строками.
+
+    Возвращает число удалённых строк по моделям.
+    """
+    throttle = Throttle(pause)
+    hidden_titles = Title.all_objects.filter(is_hidden=True)
+    hidden_reviews = Review.all_objects.filter(is_hidden=True)
+    doomed_reviews = Review.all_objects.filter(
+        title__in=hidden_titles.values('pk')
+    )
+    counts = {}
+    counts['comments'] = delete_in_batches(
+        Comment.objects.filter(review__in=hidden_reviews.values('pk')),
+        batch_size, throttle,
+    ) + delete_in_batches(
+        Comment.objects.filter(review__in=doomed_reviews.values('pk')),
+        batch_size, throttle,
+    )
+    counts['reviews'] = delete_in_batches(
+        hidden_reviews, batch_size, throttle
+    ) + delete_in_batches(doomed_reviews, batch_size, throttle)
+    for model in (GenreTitle, ScoreCount):
+        delete_in_batches(
+            model.objects.filter(title__in=hidden_titles.values('pk')),
+            batch_size, throttle,
+        )
+    counts['titles'] = delete_in_batches(hidden_titles, batch_size, throttle)
+    return counts
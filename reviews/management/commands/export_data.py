@@ -0,0 +1,51 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.csv_data import DATASETS, RENDERERS, TABLES_BY_NAME, get_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает таблицы в CSV/NDJSON в формате static/data, '
+        'читая базу серверным курсором пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets', nargs='*',
+            help=f'Наборы данных ({", ".join(DATASETS)}); по умолчанию все.',
+        )
+        parser.add_argument(
+            '--format', choices=list(RENDERERS), default='csv',
+        )
+        parser.add_argument(
+            '--output', default='.',
+            help='Каталог для файлов; "-" — писать в stdout.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        render = RENDERERS[options['format']]
+        unknown = set(options['datasets']) - set(DATASETS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные наборы данных: {", ".join(sorted(unknown))}'
+            )
+        for name in options['datasets'] or DATASETS:
+            columns, rows = get_dataset(name, options['chunk_size'])
+            if options['output'] == '-':
+                for line in render(columns, rows):
+                    self.stdout.write(line, ending='')
+                continue
+            path = os.path.join(
+                options['output'], self.get_filename(name, options['format'])
+            )
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                file.writelines(render(columns, rows))
+            self.stdout.write(f'{name}: {path}')
+
+    def get_filename(self, name, file_format):
+        if name in TABLES_BY_NAME:
+            name = os.path.splitext(TABLES_BY_NAME[name].filename)[0]
+        return f'{name}.{file_format}'
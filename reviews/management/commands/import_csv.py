@@ -0,0 +1,112 @@
+import os
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from api.cache import invalidate
+from reviews.csv_data import (DATA_DIR, TABLES, TABLES_BY_NAME, chunked,
+                              keep_auto_now, read_objects)
+from reviews.models import Title
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает CSV из static/data (или другого каталога) пачками '
+        'через bulk_create в порядке зависимостей таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=DATA_DIR)
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--only', nargs='+', choices=list(TABLES_BY_NAME),
+            help='Загрузить только указанные таблицы.',
+        )
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='Обновлять строки с существующими id вместо ошибки.',
+        )
+        parser.add_argument(
+            '--title-author',
+            help='Автор произведений (username), по умолчанию первый admin.',
+        )
+
+    def handle(self, *args, **options):
+        tables = [
+            table for table in TABLES
+            if not options['only'] or table.name in options['only']
+        ]
+        imported = []
+        for table in tables:
+            path = os.path.join(options['path'], table.filename)
+            if not os.path.exists(path):
+                self.stdout.write(f'{table.filename}: файл не найден, пропуск')
+                continue
+            defaults = None
+            if table.model is Title:
+                defaults = {'author_id': self.get_title_author(options)}
+            with keep_auto_now(table.model), transaction.atomic():
+                self.import_table(table, path, defaults, options)
+            imported.append(table.model)
+        if not imported:
+            return
+        self.reset_sequences(imported)
+        call_command('rebuild_ratings', stdout=self.stdout)
+        invalidate('titles', 'genres', 'categories', 'snapshots')
+
+    def import_table(self, table, path, defaults, options):
+        started = time.monotonic()
+        total = 0
+        objects = read_objects(table, path, defaults)
+        for chunk in chunked(objects, options['chunk_size']):
+            if options['upsert']:
+                self.upsert(table, chunk)
+            else:
+                table.model.objects.bulk_create(chunk)
+            total += len(chunk)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{table.filename}: {total} строк, '
+                f'{total / max(elapsed, 1e-6):.0f} строк/с'
+            )
+
+    def upsert(self, table, chunk):
+        model = table.model
+        # Скрытые строки тоже существуют: обновляем их, а не создаём.
+        manager = model._base_manager
+        existing = set(manager.filter(
+            pk__in=[obj.pk for obj in chunk]
+        ).values_list('pk', flat=True))
+        fields = [
+            attname for _, attname in table.columns if attname != 'id'
+        ]
+        fields = [model._meta.get_field(name).name for name in fields]
+        manager.bulk_update(
+            [obj for obj in chunk if obj.pk in existing], fields
+        )
+        manager.bulk_create(
+            [obj for obj in chunk if obj.pk not in existing]
+        )
+
+    def get_title_author(self, options):
+        users = User.objects.order_by('id')
+        if options['title_author']:
+            users = users.filter(username=options['title_author'])
+        else:
+            users = users.filter(role=User.ADMIN)
+        author_id = users.values_list('id', flat=True).first()
+        if author_id is None:
+            raise CommandError(
+                'Не найден автор для произведений, укажите --title-author.'
+            )
+        return author_id
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
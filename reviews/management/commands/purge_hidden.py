@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.deletion import purge_hidden
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет скрытые через API произведения и отзывы вместе с '
+        'зависимыми строками небольшими пачками с паузами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Минимальная пауза между пачками, секунды.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя скрытые строки.',
+        )
+        parser.add_argument('--interval', type=float, default=60)
+
+    def handle(self, *args, **options):
+        while True:
+            counts = purge_hidden(
+                batch_size=options['batch_size'], pause=options['pause']
+            )
+            if any(counts.values()):
+                self.stdout.write(
+                    f'Удалено произведений: {counts["titles"]}, '
+                    f'отзывов: {counts["reviews"]}, '
+                    f'комментариев: {counts["comments"]}'
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сумму, количество и средний рейтинг произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить агрегаты, ничего не изменяя.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        check = options['check']
+        mismatched = rebuild_ratings(
+            fix=not check, batch_size=options['batch_size']
+        )
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS('Рейтинги корректны.'))
+            return
+        ids = ', '.join(map(str, mismatched[:20]))
+        if check:
+            raise CommandError(
+                f'Неверный рейтинг у {len(mismatched)} произведений: {ids}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлен рейтинг у {len(mismatched)} произведений: {ids}'
+        ))
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+INDEX_NAME = 'reviews_title_search_idx'
+
+# Выражение совпадает с SearchVector('name', 'description', config='simple')
+# из api/search.py, иначе PostgreSQL не сможет использовать индекс.
+CREATE_INDEX = f'''
+    CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON reviews_title
+    USING gin (to_tsvector('simple'::regconfig,
+        COALESCE(name, '') || ' ' || COALESCE(description, '')))
+'''
+DROP_INDEX = f'DROP INDEX IF EXISTS {INDEX_NAME}'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating_aggregate'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
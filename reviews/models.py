@@ -1,11 +1,19 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from users.models import User
 
 from .validators import title_year_validator
 
 
+class VisibleManager(models.Manager):
+    """Без скрытых (удалённых через API) строк; их удаляет purge_hidden."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_hidden=False)
+
+
 class Category(models.Model):
     name = models.CharField(max_length=256, verbose_name='Название жанра')
     slug = models.SlugField(unique=True, max_length=50)
@@ -50,10 +58,38 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория'
     )
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Рейтинг'
+    )
+    # Растут при любом изменении произведения, его отзывов и комментариев;
+    # по ним API отвечает 304 Not Modified (см. reviews.versions).
+    version = models.PositiveIntegerField(default=0, editable=False)
+    modified = models.DateTimeField(default=timezone.now, editable=False)
+    is_hidden = models.BooleanField(default=False, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=['-rating', '-rating_count'], name='title_rating_idx'
+            ),
+            models.Index(
+                fields=['category', '-rating'],
+                name='title_category_rating_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -67,6 +103,14 @@ class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                name='unique_genre_title'
+            )
+        ]
+
     def __str__(self):
         return f'{self.genre} {self.title}'
 
@@ -90,20 +134,67 @@ class Review(models.Model):
         on_delete=models.CASCADE,
         related_name='reviews'
     )
+    is_hidden = models.BooleanField(default=False, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return f'{self.author} - {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
     class Meta:
         constraints = [
+            # Скрытый отзыв не мешает автору написать новый.
             models.UniqueConstraint(
                 fields=['author', 'title'],
+                condition=models.Q(is_hidden=False),
                 name='unique_reviews_fields'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         ordering = ['-pub_date']
 
 
+class ScoreCount(models.Model):
+    """Сколько отзывов с оценкой score у произведения.
+
+    Обновляется вместе с отзывом (reviews.ratings.update_scores),
+    гистограмма произведения — не больше десяти строк.
+    """
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='score_counts'
+    )
+    score = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'], name='unique_title_score'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
+
 class Comment(models.Model):
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='comments')
@@ -119,5 +210,13 @@ class Comment(models.Model):
         db_index=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
+
     def __str__(self):
         return self.text
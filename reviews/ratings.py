@@ -0,0 +1,155 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from .csv_data import chunked
+from .models import Review, ScoreCount, Title
+from .versions import touch_titles, version_fields
+
+
+def update_rating(title_id, score_delta, count_delta):
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+        **version_fields(),
+    )
+
+
+def update_scores(title_id, score, delta):
+    """Меняет счётчик оценки score в гистограмме произведения."""
+    counts = ScoreCount.objects.filter(title_id=title_id, score=score)
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        # Строку успел создать параллельный отзыв.
+        counts.update(count=F('count') + delta)
+
+
+def calculate_scores(title_ids=None):
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        reviews = reviews.filter(title__in=title_ids)
+    rows = reviews.order_by().values('title', 'score').annotate(
+        count=Count('id')
+    )
+    scores = {}
+    for row in rows:
+        scores.setdefault(row['title'], {})[row['score']] = row['count']
+    return scores
+
+
+def stored_scores(title_ids=None):
+    counts = ScoreCount.objects.filter(count__gt=0)
+    if title_ids is not None:
+        counts = counts.filter(title__in=title_ids)
+    scores = {}
+    for title_id, score, count in counts.values_list(
+            'title', 'score', 'count'):
+        scores.setdefault(title_id, {})[score] = count
+    return scores
+
+
+def replace_scores(scores, title_ids):
+    ScoreCount.objects.filter(title__in=title_ids).delete()
+    # Размер пачки вставки выбирает Django: на SQLite batch_size=1000
+    # превышает лимит слагаемых составного SELECT (500).
+    ScoreCount.objects.bulk_create([
+        ScoreCount(title_id=title_id, score=score, count=count)
+        for title_id in title_ids
+        for score, count in scores.get(title_id, {}).items()
+    ])
+
+
+def refresh_scores(title_id):
+    replace_scores(calculate_scores([title_id]), [title_id])
+
+
+def rebuild_scores(fix=True, batch_size=1000):
+    """Сверяет гистограммы оценок с отзывами, возвращает id расхождений."""
+    expected = calculate_scores()
+    stored = stored_scores()
+    mismatched = sorted(
+        title_id for title_id in set(expected) | set(stored)
+        if expected.get(title_id) != stored.get(title_id)
+    )
+    if fix:
+        for chunk in chunked(mismatched, batch_size):
+            replace_scores(expected, chunk)
+    return mismatched
+
+
+def calculate_ratings(title_ids=None):
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        reviews = reviews.filter(title__in=title_ids)
+    rows = reviews.order_by().values('title').annotate(
+        total=Sum('score'), count=Count('id')
+    )
+    return {row['title']: (row['total'], row['count']) for row in rows}
+
+
+def refresh_rating(title_id):
+    total, count = calculate_ratings([title_id]).get(title_id, (0, 0))
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=total,
+        rating_count=count,
+        rating=total / count if count else None,
+        **version_fields(),
+    )
+
+
+def _same_rating(stored, expected):
+    if stored is None or expected is None:
+        return stored is expected
+    return abs(stored - expected) < 1e-9
+
+
+def rebuild_ratings(fix=True, batch_size=1000):
+    """Сверяет агрегаты рейтинга с отзывами и исправляет расхождения.
+
+    Гистограммы оценок сверяются там же (rebuild_scores). Возвращает
+    список id произведений, у которых агрегат был неверным.
+    """
+    expected = calculate_ratings()
+    mismatched = []
+    batch = []
+    titles = Title.objects.only(
+        'id', 'rating_sum', 'rating_count', 'rating'
+    ).order_by('id')
+    for title in titles.iterator(chunk_size=batch_size):
+        total, count = expected.get(title.id, (0, 0))
+        rating = total / count if count else None
+        if ((title.rating_sum, title.rating_count) == (total, count)
+                and _same_rating(title.rating, rating)):
+            continue
+        mismatched.append(title.id)
+        if not fix:
+            continue
+        title.rating_sum, title.rating_count = total, count
+        title.rating = rating
+        batch.append(title)
+        if len(batch) >= batch_size:
+            Title.objects.bulk_update(
+                batch, ['rating_sum', 'rating_count', 'rating']
+            )
+            batch = []
+    if batch:
+        Title.objects.bulk_update(
+            batch, ['rating_sum', 'rating_count', 'rating']
+        )
+    if fix:
+        for chunk in chunked(mismatched, batch_size):
+            touch_titles(pk__in=chunk)
+    return sorted(set(mismatched) | set(rebuild_scores(fix, batch_size)))
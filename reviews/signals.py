@@ -0,0 +1,86 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .ratings import (refresh_rating, refresh_scores, update_rating,
+                      update_scores)
+from .versions import touch_titles
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    # Оценку скрытого отзыва hide_review уже убрал из рейтинга.
+    if raw or instance.is_hidden:
+        return
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        update_rating(instance.title_id, instance.score, 1)
+        update_scores(instance.title_id, instance.score, 1)
+    elif loaded_score is None:
+        refresh_rating(instance.title_id)
+        refresh_scores(instance.title_id)
+    elif instance.score != loaded_score:
+        update_rating(instance.title_id, instance.score - loaded_score, 0)
+        update_scores(instance.title_id, loaded_score, -1)
+        update_scores(instance.title_id, instance.score, 1)
+    else:
+        touch_titles(pk=instance.title_id)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if instance.is_hidden:
+        return
+    update_rating(instance.title_id, -instance.score, -1)
+    update_scores(instance.title_id, instance.score, -1)
+
+
+# Остальные приёмники только повышают версию произведения. update_rating
+# и refresh_rating делают это сами в том же UPDATE, что и рейтинг.
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, raw, **kwargs):
+    if not raw:
+        touch_titles(pk=instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        touch_titles(reviews=instance.review_id)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        touch_titles(pk=instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            touch_titles(pk=instance.pk)
+    elif action == 'pre_clear':
+        touch_titles(genre=instance)
+    elif action in ('post_add', 'post_remove'):
+        touch_titles(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Genre)
+def genre_saved(sender, instance, raw, **kwargs):
+    if not raw:
+        touch_titles(genre=instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    # pre_delete: после удаления SET_NULL уже отвяжет произведения.
+    if not kwargs.get('raw'):
+        touch_titles(category=instance)
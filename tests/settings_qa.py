@@ -4,5 +4,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    },
+    # Отдельная база, а не зеркало: тесты маршрутизации видят, что
+    # чтение ушло в реплику, по пустым ответам.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+    },
 }
+# Тесты включают реплику сами через DATABASE_REPLICAS.
+DATABASE_REPLICAS = []
+
+QUERY_WATCH_ENABLED = True
+QUERY_WATCH_STRICT = True
+
+THROTTLE_STORE = 'api.throttling.LocalBucketStore'
+
+# Тесты идут в одном процессе: локального кэша достаточно.
+CATALOG_CACHE_ENABLED = True
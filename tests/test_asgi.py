@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+
+from api_yamdb.asgi import application
+
+
+def run(scope, *messages):
+    async def communicate():
+        communicator = ApplicationCommunicator(application, scope)
+        for message in messages:
+            await communicator.send_input(message)
+        responses = [await communicator.receive_output(5)]
+        while responses[-1].get('more_body') or (
+                responses[-1]['type'] == 'http.response.start'):
+            responses.append(await communicator.receive_output(5))
+        return responses
+    return asyncio.run(communicate())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgi:
+
+    def test_lifespan(self):
+        response = run(
+            {'type': 'lifespan'}, {'type': 'lifespan.startup'}
+        )
+        assert response == [{'type': 'lifespan.startup.complete'}]
+
+    def test_http_request(self):
+        start, *body = run({
+            'type': 'http', 'http_version': '1.1', 'method': 'GET',
+            'path': '/api/v1/titles/',
+            'query_string': b'', 'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80), 'scheme': 'http',
+        }, {'type': 'http.request', 'body': b''})
+        assert start['status'] == 200, (
+            'ASGI-приложение должно отвечать на запросы к API'
+        )
+        content = b''.join(message.get('body', b'') for message in body)
+        assert json.loads(content)['results'] == []
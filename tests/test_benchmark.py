@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from api.benchmark import seed_from_csv
+from api.replay import (Sample, build_calls, compare_reports, read_mix,
+                        run_wsgi, summarize_samples, without_throttling)
+from reviews.csv_data import DATA_DIR, TABLES, read_objects
+from reviews.models import Genre, Title
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    def test_seed_scales_csv(self):
+        seed_from_csv(3)
+        for table in TABLES:
+            rows = read_objects(
+                table, os.path.join(DATA_DIR, table.filename)
+            )
+            assert table.model.objects.count() == len(list(rows)) * 3, (
+                f'Каждая копия должна повторять объём {table.filename}'
+            )
+        assert Genre.objects.filter(slug='2-drama').exists(), (
+            'Уникальные поля копий должны получать префикс номера копии'
+        )
+        assert not Title.objects.filter(
+            rating_count__gt=0, rating__isnull=True
+        ).exists(), 'После загрузки рейтинги должны быть пересчитаны'
+
+    def test_mix_runs_without_errors(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'auth': '1/min', 'write': '1/min'},
+        }
+        seed_from_csv(1)
+        calls = build_calls(read_mix(), 60, seed=1)
+        with without_throttling():
+            samples, elapsed = run_wsgi(calls)
+        failed = [
+            (sample.name, sample.status) for sample in samples
+            if sample.status >= 400
+        ]
+        assert not failed, f'Смесь запросов вернула ошибки: {failed}'
+        report = summarize_samples(samples, elapsed)
+        assert {'titles', 'reviews', 'total'} <= set(report)
+        assert report['total']['count'] == 60
+        assert report['titles']['queries'] is not None, (
+            'В режиме WSGI должны считаться SQL-запросы'
+        )
+
+    def test_client_errors_counted(self):
+        samples = [
+            Sample('auth', 'token', status, 0.001, 1)
+            for status in (200, 400, 429, 500, 0)
+        ]
+        assert summarize_samples(samples, 1.0)['auth']['errors'] == 4, (
+            'Ответы 4xx (в том числе 429) не должны считаться успешными'
+        )
+
+    def test_compare_reports(self):
+        baseline = {'titles': {'p95_ms': 10.0, 'queries': 2.0}}
+        lines, regressions = compare_reports(baseline, {
+            'titles': {'p95_ms': 11.0, 'queries': 2.0},
+        })
+        assert len(lines) == 1 and not regressions
+        _, regressions = compare_reports(baseline, {
+            'titles': {'p95_ms': 15.0, 'queries': 3.0},
+        })
+        assert len(regressions) == 2, (
+            'Рост p95 выше порога и лишние SQL-запросы — регрессии'
+        )
@@ -0,0 +1,159 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, GenreTitle, Title
+
+TITLES_URL = '/api/v1/titles/bulk/'
+
+
+def make_titles(count):
+    return [
+        {
+            'name': f'Произведение {number}', 'year': 2000,
+            'genre': ['drama', 'comedy'], 'category': 'movie',
+        }
+        for number in range(count)
+    ]
+
+
+def post_bulk(client, url, data, method='post'):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(
+            url, data=data, format='json'
+        )
+    return response, len(context)
+
+
+@pytest.mark.django_db
+class TestBulkWrite:
+
+    def test_create_titles(self, admin_client, category, genres):
+        response, _ = post_bulk(admin_client, TITLES_URL, make_titles(3))
+        assert response.status_code == 201, (
+            'Пакетное создание произведений должно возвращать статус 201'
+        )
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            'Произведение 0', 'Произведение 1', 'Произведение 2'
+        ], 'Ответ должен повторять порядок объектов в запросе'
+        assert sorted(data[0]['genre']) == ['comedy', 'drama']
+        assert data[0]['category'] == 'movie'
+        assert Title.objects.count() == 3
+        assert GenreTitle.objects.count() == 6, (
+            'Связи с жанрами должны создаваться вместе с произведениями'
+        )
+        assert set(Title.objects.values_list('id', flat=True)) == {
+            item['id'] for item in data
+        }
+
+    def test_query_count_does_not_grow(self, admin_client, category, genres):
+        post_bulk(admin_client, TITLES_URL, make_titles(1))
+        _, few = post_bulk(admin_client, TITLES_URL, make_titles(2))
+        _, many = post_bulk(admin_client, TITLES_URL, make_titles(50))
+        assert few == many, (
+            'Число SQL-запросов не должно зависеть от размера пакета: '
+            f'{few} для 2 объектов и {many} для 50'
+        )
+
+    def test_errors_by_position(self, admin_client, category, genres):
+        items = make_titles(3)
+        items[1]['genre'] = ['drama', 'western']
+        items[2]['category'] = 'book'
+        response, _ = post_bulk(admin_client, TITLES_URL, items)
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}, 'Корректный объект не должен иметь ошибок'
+        assert list(errors[1]) == ['genre']
+        assert list(errors[2]) == ['category']
+        assert not Title.objects.exists(), (
+            'При ошибке в пакете ничего не должно сохраняться'
+        )
+
+    def test_field_errors(self, admin_client, category, genres):
+        items = make_titles(2)
+        items[1]['year'] = 3000
+        response, _ = post_bulk(admin_client, TITLES_URL, items)
+        assert response.status_code == 400
+        assert list(response.json()[1]) == ['year']
+
+    def test_update_titles(self, admin_client, title):
+        response, _ = post_bulk(admin_client, TITLES_URL, [
+            {'id': title.id, 'name': 'Новое имя', 'genre': ['comedy']},
+        ], method='patch')
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert title.name == 'Новое имя'
+        assert title.year == 1994, 'Непереданные поля не должны меняться'
+        assert list(title.genre.values_list('slug', flat=True)) == [
+            'comedy'
+        ]
+
+    def test_update_unknown_title(self, admin_client, title):
+        response, _ = post_bulk(admin_client, TITLES_URL, [
+            {'id': title.id, 'name': 'Новое имя'}, {'id': 0, 'name': 'Нет'},
+        ], method='patch')
+        assert response.status_code == 400
+        assert list(response.json()[1]) == ['id']
+        title.refresh_from_db()
+        assert title.name != 'Новое имя'
+
+    def test_create_genres_checks_slugs(self, admin_client, genres):
+        response, _ = post_bulk(admin_client, '/api/v1/genres/bulk/', [
+            {'name': 'Триллер', 'slug': 'thriller'},
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Триллер', 'slug': 'thriller'},
+        ])
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert list(errors[1]) == ['slug'], 'Занятый slug — ошибка'
+        assert list(errors[2]) == ['slug'], 'Повтор slug в пакете — ошибка'
+        assert Genre.objects.count() == 2
+
+    def test_create_requires_name(self, admin_client):
+        for url in ('/api/v1/genres/bulk/', '/api/v1/categories/bulk/'):
+            response, _ = post_bulk(admin_client, url, [{'slug': 'x'}])
+            assert response.status_code == 400, (
+                'Новый объект без name создаваться не должен'
+            )
+            assert list(response.json()[0]) == ['name']
+        assert not Genre.objects.exists()
+        assert not Category.objects.exists()
+
+    def test_patch_without_name(self, admin_client, category):
+        response, _ = post_bulk(admin_client, '/api/v1/categories/bulk/', [
+            {'slug': 'movie'},
+        ], method='patch')
+        assert response.status_code == 200
+        assert Category.objects.get(slug='movie').name == category.name
+
+    def test_categories_create_and_update(self, admin_client, category):
+        url = '/api/v1/categories/bulk/'
+        response, _ = post_bulk(admin_client, url, [
+            {'name': 'Книга', 'slug': 'book'},
+        ])
+        assert response.status_code == 201
+        assert response.json() == [{'name': 'Книга', 'slug': 'book'}]
+        response, _ = post_bulk(admin_client, url, [
+            {'name': 'Кино', 'slug': 'movie'},
+        ], method='patch')
+        assert response.status_code == 200
+        assert Category.objects.get(slug='movie').name == 'Кино'
+
+    def test_bulk_invalidates_cache(self, client, admin_client, category,
+                                    genres):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        post_bulk(admin_client, TITLES_URL, make_titles(2))
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Пакетная запись должна сбрасывать кэш каталога'
+        )
+
+    @pytest.mark.parametrize('data', [[], {'name': 'Объект'}])
+    def test_requires_list(self, admin_client, data):
+        response, _ = post_bulk(admin_client, '/api/v1/genres/bulk/', data)
+        assert response.status_code == 400
+
+    def test_only_admin(self, user_client, category, genres):
+        response, _ = post_bulk(user_client, TITLES_URL, make_titles(1))
+        assert response.status_code == 403
@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import cache_stats, get_versions
+from reviews.models import Genre
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+
+    def test_repeated_get_is_served_from_cache(self, client, title):
+        url = '/api/v1/titles/?genre=drama&limit=5'
+        first = client.get(url)
+        hits = cache_stats()['hits']
+        with CaptureQueriesContext(connection) as context:
+            second = client.get('/api/v1/titles/?limit=5&genre=drama')
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert len(context) == 0
+        assert second.json() == first.json()
+        assert cache_stats()['hits'] == hits + 1
+
+    def test_unknown_params_bypass_cache(self, client, title):
+        response = client.get('/api/v1/titles/?utm=1')
+        assert 'X-Cache' not in response
+
+    @pytest.mark.django_db(transaction=True)
+    def test_review_invalidates_title(self, client, title, user_client):
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] is None
+        user_client.post(
+            f'{url}reviews/', data={'text': 'Отзыв', 'score': 9}
+        )
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 9
+        assert client.get('/api/v1/titles/').json()['results'][0][
+            'rating'] == 9
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalidated_after_commit(self, client, genres):
+        before = get_versions(['genres'])
+        with transaction.atomic():
+            genres[0].name = 'Правка'
+            genres[0].save()
+            assert get_versions(['genres']) == before, (
+                'До COMMIT версия не должна меняться: иначе в кэш под '
+                'новой версией попадут незафиксированные данные'
+            )
+        assert get_versions(['genres']) != before
+
+    @pytest.mark.django_db(transaction=True)
+    def test_genre_change_invalidates_lists(self, client, title):
+        client.get('/api/v1/genres/')
+        client.get(f'/api/v1/titles/{title.id}/')
+        Genre.objects.filter(slug='drama').get().delete()
+        genres = client.get('/api/v1/genres/').json()['results']
+        assert [genre['slug'] for genre in genres] == ['comedy']
+        detail = client.get(f'/api/v1/titles/{title.id}/').json()
+        assert [genre['slug'] for genre in detail['genre']] == ['comedy']
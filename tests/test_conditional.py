@@ -0,0 +1,95 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review
+
+
+@pytest.fixture
+def review(title, user):
+    return Review.objects.create(title=title, author=user, text='', score=5)
+
+
+@pytest.fixture
+def urls(title, review):
+    base = f'/api/v1/titles/{title.id}/'
+    return {
+        'title': base,
+        'reviews': f'{base}reviews/',
+        'review': f'{base}reviews/{review.id}/',
+        'comments': f'{base}reviews/{review.id}/comments/',
+    }
+
+
+def revalidate(client, url, etag):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, len(context)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    @pytest.mark.parametrize('name', ['title', 'reviews', 'review',
+                                      'comments'])
+    def test_not_modified(self, client, urls, name):
+        first = client.get(urls[name])
+        assert first.status_code == 200
+        assert first.has_header('ETag') and first.has_header(
+            'Last-Modified'), 'Ответ должен содержать ETag и Last-Modified'
+        response, queries = revalidate(client, urls[name], first['ETag'])
+        assert response.status_code == 304, (
+            f'`{urls[name]}` с актуальным If-None-Match должен вернуть 304'
+        )
+        assert response.content == b''
+        assert response['ETag'] == first['ETag']
+        assert queries == 1, (
+            'Для 304 достаточно одного запроса версии, '
+            f'выполнено {queries}'
+        )
+
+    def test_if_modified_since(self, client, urls):
+        first = client.get(urls['title'])
+        response = client.get(
+            urls['title'], HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize('name', ['title', 'reviews', 'comments'])
+    def test_new_review_changes_etag(self, client, another_user_client,
+                                     urls, name):
+        etag = client.get(urls[name])['ETag']
+        another_user_client.post(
+            urls['reviews'], data={'text': 'Отзыв', 'score': 9}
+        )
+        response, _ = revalidate(client, urls[name], etag)
+        assert response.status_code == 200, (
+            'Новый отзыв должен менять версию произведения'
+        )
+        assert response['ETag'] != etag
+
+    def test_comment_edit_changes_etag(self, client, user_client, urls,
+                                       review, user):
+        comment = Comment.objects.create(
+            review=review, author=user, text='Текст'
+        )
+        etag = client.get(urls['comments'])['ETag']
+        user_client.patch(
+            f'{urls["comments"]}{comment.id}/', data={'text': 'Новый текст'}
+        )
+        response, _ = revalidate(client, urls['comments'], etag)
+        assert response.status_code == 200
+        assert response.json()['results'][0]['text'] == 'Новый текст'
+
+    def test_genre_rename_changes_etag(self, client, urls, genres):
+        etag = client.get(urls['title'])['ETag']
+        genres[0].name = 'Новая драма'
+        genres[0].save()
+        response, _ = revalidate(client, urls['title'], etag)
+        assert response.status_code == 200, (
+            'Переименование жанра должно менять версию его произведений'
+        )
+
+    def test_unknown_title_is_404(self, client):
+        response = client.get('/api/v1/titles/0/', HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == 404
@@ -0,0 +1,49 @@
+from api import db
+
+
+class FakeConnection:
+    in_atomic_block = False
+
+    def __init__(self, usable):
+        self.connection = object()
+        self.usable = usable
+        self.checks = 0
+
+    def is_usable(self):
+        self.checks += 1
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class TestConnectionHealthCheck:
+
+    def test_only_broken_connections_are_closed(self, monkeypatch, settings):
+        settings.DB_CONN_HEALTH_CHECKS = True
+        broken, working = FakeConnection(False), FakeConnection(True)
+        monkeypatch.setattr(db.connections, 'all', lambda: [broken, working])
+        db.check_connections()
+        assert broken.connection is None
+        assert working.connection is not None
+
+    def test_checked_once_per_interval(self, monkeypatch, settings):
+        settings.DB_CONN_HEALTH_CHECKS = True
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 30
+        working = FakeConnection(True)
+        monkeypatch.setattr(db.connections, 'all', lambda: [working])
+        db.check_connections()
+        db.check_connections()
+        assert working.checks == 1, (
+            'Соединение не должно проверяться на каждом запросе'
+        )
+        settings.DB_CONN_HEALTH_CHECK_INTERVAL = 0
+        db.check_connections()
+        assert working.checks == 2
+
+    def test_disabled(self, monkeypatch, settings):
+        settings.DB_CONN_HEALTH_CHECKS = False
+        broken = FakeConnection(False)
+        monkeypatch.setattr(db.connections, 'all', lambda: [broken])
+        db.check_connections()
+        assert broken.connection is not None
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+
+from reviews.csv_data import DATA_DIR
+from reviews.deletion import hide_review, hide_title
+from reviews.models import Comment, Review, Title
+
+
+def read_header(path):
+    with open(path, encoding='utf-8') as file:
+        return next(csv.reader(file))
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_requires_admin(self, client, user_client):
+        assert client.get('/api/v1/export/titles/').status_code == 401
+        assert user_client.get('/api/v1/export/titles/').status_code == 403
+
+    def test_csv_matches_static_layout(self, admin_client, title):
+        content = self.get(admin_client, '/api/v1/export/titles/')
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == read_header(os.path.join(DATA_DIR, 'titles.csv'))
+        assert rows[1] == [
+            str(title.id), title.name, '1994', str(title.category_id)
+        ]
+
+    def test_catalog_ndjson(self, admin_client, title):
+        content = self.get(
+            admin_client, '/api/v1/export/catalog/?output=ndjson'
+        )
+        row = json.loads(content.splitlines()[0])
+        assert row['genre'] == ['comedy', 'drama']
+        assert row['category'] == 'movie'
+
+    def test_export_round_trips_through_import(self, tmp_path):
+        call_command('import_csv', stdout=io.StringIO())
+        call_command(
+            'export_data', '--output', str(tmp_path), stdout=io.StringIO()
+        )
+        for name in ('titles.csv', 'review.csv', 'genre_title.csv'):
+            assert read_header(tmp_path / name) == read_header(
+                os.path.join(DATA_DIR, name)
+            )
+        Title.objects.all().delete()
+        call_command(
+            'import_csv', '--path', str(tmp_path), '--only', 'titles',
+            'genre_title', 'review', stdout=io.StringIO()
+        )
+        assert Title.objects.count() == 32
+
+    def test_round_trip_skips_hidden_rows(self, tmp_path):
+        call_command('import_csv', stdout=io.StringIO())
+        hide_title(Title.objects.get(pk=1))
+        hide_review(Review.objects.exclude(title_id=1).first())
+        expected = (Title.objects.count(), Review.objects.filter(
+            title__is_hidden=False
+        ).count())
+        call_command(
+            'export_data', '--output', str(tmp_path), stdout=io.StringIO()
+        )
+        Title.all_objects.all().delete()
+        call_command(
+            'import_csv', '--path', str(tmp_path), '--only', 'titles',
+            'genre_title', 'review', 'comments', stdout=io.StringIO()
+        )
+        assert (Title.objects.count(), Review.objects.count()) == expected, (
+            'Выгрузка со скрытыми строками должна загружаться обратно'
+        )
+        assert Comment.objects.exists()
@@ -0,0 +1,62 @@
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def feed(django_user_model, admin, title):
+    orphan = Title.objects.create(
+        author=admin, name='Без категории', year=2000,
+        category=title.category,
+    )
+    Title.objects.filter(pk=orphan.pk).update(category=None)
+    for number in range(12):
+        author = django_user_model.objects.create_user(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text=f'Отзыв {number}',
+            score=number % 10 + 1,
+        )
+        Comment.objects.create(review=review, author=author, text='Ответ')
+        Comment.objects.create(
+            review=Review.objects.first(), author=author, text=str(number)
+        )
+    return title
+
+
+@pytest.mark.django_db
+class TestFastList:
+
+    def test_same_json(self, client, settings, feed):
+        settings.CATALOG_CACHE_ENABLED = False
+        review = Review.objects.first()
+        base = f'/api/v1/titles/{feed.id}/reviews/'
+        urls = [
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=drama&limit=1&offset=1',
+            '/api/v1/titles/?category=movie',
+            base,
+            f'{base}?page=2',
+            f'{base}?pagination=cursor&page_size=5',
+            f'{base}{review.id}/comments/',
+            f'{base}{review.id}/comments/?pagination=cursor',
+        ]
+        for url in urls:
+            settings.FAST_LIST_ENABLED = True
+            fast = client.get(url)
+            settings.FAST_LIST_ENABLED = False
+            expected = client.get(url)
+            assert fast.status_code == expected.status_code == 200
+            assert fast.content == expected.content, (
+                f'Быстрый список {url} должен отдавать тот же JSON, '
+                f'что и сериализатор'
+            )
+
+    def test_no_extra_queries(self, client, settings, feed,
+                              django_assert_num_queries):
+        settings.CATALOG_CACHE_ENABLED = False
+        with django_assert_num_queries(3):
+            client.get('/api/v1/titles/')
+        with django_assert_num_queries(3):
+            client.get(f'/api/v1/titles/{feed.id}/reviews/')
@@ -0,0 +1,43 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.deletion import hide_title
+from reviews.models import Comment, GenreTitle, Review, Title
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    def import_csv(self, *args):
+        call_command('import_csv', '--chunk-size', '10', *args,
+                     stdout=StringIO())
+
+    def test_import_static_data(self):
+        self.import_csv()
+        assert Title.objects.count() == 32
+        assert GenreTitle.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019
+        assert review.title.rating_count > 0
+
+    def test_upsert_is_idempotent(self):
+        self.import_csv()
+        Title.objects.filter(pk=1).update(name='Изменено')
+        self.import_csv('--upsert')
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Title.objects.get(pk=1).name == 'Побег из Шоушенка'
+
+    def test_upsert_keeps_hidden_rows(self):
+        self.import_csv()
+        hide_title(Title.objects.get(pk=1))
+        self.import_csv('--upsert')
+        assert Title.all_objects.count() == 32, (
+            'Повторная загрузка должна обновлять скрытые строки, а не '
+            'создавать их заново'
+        )
+        assert Title.all_objects.get(pk=1).is_hidden
@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .utils import assert_query_count
+
+
+@pytest.mark.django_db
+class TestJwtFastPath:
+
+    def test_token_carries_role_claims(self, client, admin):
+        response = client.post('/api/v1/auth/token/', data={
+            'username': admin.username,
+            'confirmation_code': default_token_generator.make_token(admin),
+        })
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == 'admin'
+        assert token['username'] == admin.username
+        assert token['is_staff'] is False
+
+    def test_cached_user_needs_no_queries(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert_query_count(user_client, url, 2 + 1)
+        assert_query_count(user_client, url, 2)
+
+    def test_claims_only_mode(self, user_client, title, settings):
+        settings.JWT_USER_CACHE_TIMEOUT = 0
+        assert_query_count(
+            user_client, f'/api/v1/titles/{title.id}/reviews/', 2
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_role_change_applies_immediately(self, admin_client, user,
+                                             user_client):
+        data = {'name': 'Жанр', 'slug': 'new-genre'}
+        assert user_client.post('/api/v1/genres/', data).status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        assert user_client.post('/api/v1/genres/', data).status_code == 201
+
+    @pytest.mark.django_db(transaction=True)
+    def test_deleted_user_is_rejected(self, admin_client, user, user_client):
+        user_client.get('/api/v1/users/me/')
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get('/api/v1/titles/').status_code == 401
+
+    def test_me_returns_full_profile(self, user_client, user):
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'first_name': 'Имя'}
+        )
+        assert response.json()['bio'] == user.bio
+
+    def test_invalid_token(self, title):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer broken')
+        assert client.get('/api/v1/titles/').status_code == 401
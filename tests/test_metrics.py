@@ -0,0 +1,71 @@
+import pytest
+from django.test import Client
+
+from api.metrics import registry
+
+
+@pytest.fixture
+def metrics_client(settings):
+    settings.PERFORMANCE_METRICS_ENABLED = True
+    settings.PERFORMANCE_METRICS_TOKEN = ''
+    registry.reset()
+    yield Client()
+    registry.reset()
+
+
+@pytest.mark.django_db
+class TestPerformanceMetrics:
+
+    def test_disabled_by_default(self, client, title):
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Без PERFORMANCE_METRICS_ENABLED замер должен быть выключен'
+        )
+        assert client.get('/metrics').status_code == 404
+
+    def test_server_timing(self, metrics_client, title):
+        response = metrics_client.get('/api/v1/titles/')
+        timing = response['Server-Timing']
+        for name in ('db;', 'serialize;', 'render;', 'total;'):
+            assert name in timing, f'В Server-Timing нет метрики {name}'
+
+    def test_prometheus_endpoint(self, metrics_client, admin_client, title):
+        metrics_client.get('/api/v1/titles/')
+        metrics_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        response = admin_client.get('/metrics')
+        assert response.status_code == 200
+        body = response.content.decode()
+        assert (
+            'yamdb_request_duration_seconds_bucket{view="TitleViewSet.list",'
+            'method="GET",le="+Inf"} 1'
+        ) in body, 'Нет гистограммы времени для TitleViewSet.list'
+        assert 'view="ReviewViewSet.list"' in body
+        queries = [
+            line for line in body.splitlines()
+            if line.startswith('yamdb_db_queries_total{view="TitleViewSet.list"')
+        ]
+        assert queries and float(queries[0].split()[-1]) > 0, (
+            'Должно учитываться число SQL-запросов представления'
+        )
+        assert 'yamdb_serialize_duration_seconds_total' in body
+        assert 'yamdb_response_size_bytes_bucket' in body
+
+    def test_admin_only_without_token(self, metrics_client, user_client,
+                                      admin_client):
+        assert metrics_client.get('/metrics').status_code == 401, (
+            'Без токена /metrics не должен быть открыт всем'
+        )
+        assert user_client.get('/metrics').status_code == 401
+        assert admin_client.get('/metrics').status_code == 200
+
+    def test_token(self, metrics_client, admin_client, settings):
+        settings.PERFORMANCE_METRICS_TOKEN = 'secret'
+        assert metrics_client.get('/metrics').status_code == 401
+        assert metrics_client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer wrong'
+        ).status_code == 401
+        response = metrics_client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret'
+        )
+        assert response.status_code == 200
+        assert admin_client.get('/metrics').status_code == 200
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def comment(user, title):
+    review = Review.objects.create(
+        title=title, author=user, text='Отзыв', score=5
+    )
+    return Comment.objects.create(review=review, author=user, text='Ответ')
+
+
+@pytest.fixture
+def other_title(admin, category):
+    return Title.objects.create(
+        author=admin, name='Другое', year=2001, category=category
+    )
+
+
+@pytest.mark.django_db
+class TestNestedParent:
+
+    def test_wrong_title_is_404(self, user_client, comment, other_title):
+        base = (
+            f'/api/v1/titles/{other_title.id}/reviews/{comment.review_id}'
+            '/comments/'
+        )
+        assert user_client.get(base).status_code == 404, (
+            'Комментарии не должны отдаваться по адресу чужого произведения'
+        )
+        assert user_client.get(f'{base}{comment.id}/').status_code == 404
+        assert user_client.post(
+            base, data={'text': 'Ответ'}
+        ).status_code == 404
+        assert Comment.objects.count() == 1
+
+    def test_parent_loaded_once(self, user_client, comment):
+        url = (
+            f'/api/v1/titles/{comment.review.title_id}/reviews/'
+            f'{comment.review_id}/comments/{comment.id}/'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Правка'})
+        assert response.status_code == 200
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(selects) == 1, (
+            'Отзыв и произведение должны загружаться одним запросом на '
+            f'весь запрос, включая проверку прав:\n{selects}'
+        )
@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.admin import site
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def signup(self, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'newuser', 'email': 'newuser@yamdb.fake'
+        })
+        assert response.status_code == 200
+        return OutgoingEmail.objects.get(to='newuser@yamdb.fake')
+
+    def test_signup_does_not_send_email(self, client):
+        email = self.signup(client)
+        assert mail.outbox == []
+        assert email.status == OutgoingEmail.PENDING
+        assert 'Ваш код подтверждения' in email.body
+
+    def test_worker_sends_pending_emails(self, client):
+        email = self.signup(client)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+        assert [message.to for message in mail.outbox] == [[email.to]]
+        assert 'Ваш код подтверждения' in mail.outbox[0].body
+        assert email.body == '', (
+            'После отправки код подтверждения не должен храниться в базе'
+        )
+
+    def test_admin_hides_body(self, client):
+        email = self.signup(client)
+        model_admin = site._registry[OutgoingEmail]
+        form = model_admin.get_form(None, email)
+        assert 'body' not in form.base_fields, (
+            'Админка не должна показывать текст письма с кодом'
+        )
+
+    def test_failed_delivery_is_retried_later(self, client, monkeypatch):
+        email = self.signup(client)
+
+        def broken(self, messages):
+            raise ConnectionError('relay is down')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken)
+        call_command('send_emails', '--max-attempts', '2')
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (OutgoingEmail.PENDING, 1)
+        assert email.next_attempt_at > email.created
+
+        call_command('send_emails', '--max-attempts', '2')
+        email.refresh_from_db()
+        assert email.attempts == 1
+
+    def test_connection_failure_postpones_batch(self, client, monkeypatch):
+        email = self.signup(client)
+
+        def refuse(self):
+            raise ConnectionRefusedError('smtp is down')
+
+        monkeypatch.setattr(EmailBackend, 'open', refuse)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (OutgoingEmail.PENDING, 1), (
+            'Ошибка соединения должна откладывать письма, а не ронять worker'
+        )
+        assert 'smtp is down' in email.last_error
+        assert email.next_attempt_at > email.created
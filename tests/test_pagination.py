@@ -0,0 +1,61 @@
+import pytest
+from django.utils import timezone
+
+from reviews.models import Review
+
+
+@pytest.fixture
+def reviews(title, django_user_model):
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{number}', email=f'author{number}@yamdb.fake'
+        ) for number in range(5)
+    ]
+    reviews = [
+        Review.objects.create(title=title, author=author, text='', score=5)
+        for author in authors
+    ]
+    Review.objects.filter(id__in=[review.id for review in reviews[:3]]).update(
+        pub_date=timezone.now()
+    )
+    return reviews
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def test_page_number_is_default(self, client, title, reviews):
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == 5
+
+    def test_cursor_walks_all_reviews_once(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&page_size=2'
+        seen = []
+        pages = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data
+            seen.extend(item['id'] for item in data['results'])
+            pages.append(data)
+            url = data['next']
+        assert sorted(seen) == sorted(review.id for review in reviews)
+        assert len(seen) == len(set(seen))
+        assert pages[0]['previous'] is None
+
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results']
+
+    def test_new_reviews_do_not_shift_pages(self, client, title, reviews,
+                                            admin):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&page_size=2'
+        first = client.get(url).json()
+        Review.objects.create(title=title, author=admin, text='', score=1)
+        second = client.get(first['next']).json()
+        first_ids = {item['id'] for item in first['results']}
+        assert not first_ids & {item['id'] for item in second['results']}
+
+    def test_invalid_cursor(self, client, title, reviews):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=broken'
+        )
+        assert response.status_code == 404
@@ -0,0 +1,40 @@
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+from .utils import assert_query_count
+
+
+@pytest.fixture
+def catalog(title, admin, user, another_user, category, genres):
+    for number in range(3):
+        extra = Title.objects.create(
+            author=admin, name=f'Произведение {number}', year=2000,
+            category=category
+        )
+        extra.genre.set(genres)
+    reviews = [
+        Review.objects.create(title=title, author=author, text='', score=5)
+        for author in (admin, user, another_user)
+    ]
+    for author in (admin, user, another_user):
+        Comment.objects.create(review=reviews[0], author=author, text='')
+    return title, reviews[0]
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+
+    @pytest.mark.parametrize('url, expected', [
+        ('/api/v1/titles/', 3),
+        # Версия для ETag + произведение с категорией + жанры.
+        ('/api/v1/titles/{title}/', 3),
+        ('/api/v1/titles/{title}/reviews/', 3),
+        ('/api/v1/titles/{title}/reviews/{review}/', 2),
+        ('/api/v1/titles/{title}/reviews/{review}/comments/', 3),
+    ])
+    def test_query_budget(self, client, catalog, url, expected):
+        title, review = catalog
+        assert_query_count(
+            client, url.format(title=title.id, review=review.id), expected
+        )
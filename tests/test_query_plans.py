@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+
+from api.benchmark import seed_catalog
+from reviews.models import Comment, Review, Title
+
+from .utils import assert_no_seq_scan
+
+
+@pytest.fixture
+def seeded():
+    seed_catalog(titles=50, reviews=500, genres=5, categories=3)
+    review = Review.objects.order_by('id').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author_id=review.author_id, text=str(number))
+        for number in range(50)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return review
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    @pytest.mark.parametrize('url, tables', [
+        ('/api/v1/titles/{title}/reviews/', ['reviews_review']),
+        ('/api/v1/titles/{title}/reviews/?pagination=cursor',
+         ['reviews_review']),
+        ('/api/v1/titles/{title}/reviews/{review}/comments/',
+         ['reviews_comment']),
+        ('/api/v1/titles/?category=category-1', ['reviews_title']),
+        ('/api/v1/titles/?genre=genre-2', ['reviews_title']),
+        ('/api/v1/titles/?year=1910', ['reviews_title']),
+    ])
+    def test_endpoint_uses_indexes(self, client, seeded, url, tables):
+        assert_no_seq_scan(
+            client,
+            url.format(title=seeded.title_id, review=seeded.id),
+            tables,
+        )
+
+    def test_detects_seq_scan(self, client, seeded):
+        with pytest.raises(AssertionError):
+            assert_no_seq_scan(
+                client, '/api/v1/titles/?name=1', [Title._meta.db_table]
+            )
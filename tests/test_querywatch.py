@@ -0,0 +1,70 @@
+import json
+import logging
+
+import pytest
+
+from api.querywatch import QueryWatchError, query_shape, watch_queries
+from api.serializers import ReviewSerializer
+from reviews.models import Review
+
+
+@pytest.fixture
+def reviews(django_user_model, title):
+    for number in range(6):
+        author = django_user_model.objects.create_user(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=number + 1
+        )
+
+
+@pytest.mark.django_db
+class TestQueryWatch:
+
+    def test_query_shape(self):
+        assert query_shape(
+            'SELECT * FROM t WHERE id IN (%s, %s, %s)'
+        ) == query_shape('SELECT * FROM t WHERE id IN (%s, %s)'), (
+            'Списки IN разной длины должны давать одну форму запроса'
+        )
+
+    def test_detects_n_plus_one(self, reviews, caplog):
+        with pytest.raises(QueryWatchError):
+            with watch_queries('test'):
+                [review.author.username for review in Review.objects.all()]
+        events = [
+            record.query_event for record in caplog.records
+            if record.name == 'api.queries'
+        ]
+        assert events and events[0]['kind'] == 'n_plus_one', (
+            'N+1 должен попадать в лог api.queries'
+        )
+        assert events[0]['count'] == 6
+        assert 'test_querywatch.py' in events[0]['frame'], (
+            'В событии должен быть кадр стека, откуда пошли запросы'
+        )
+
+    def test_endpoint_without_select_related(self, client, title, reviews,
+                                             monkeypatch, settings):
+        settings.FAST_LIST_ENABLED = False
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        assert client.get(url).status_code == 200
+        monkeypatch.setattr(ReviewSerializer.Meta, 'select_related', ())
+        with pytest.raises(QueryWatchError, match='ReviewViewSet.list'):
+            client.get(url)
+
+    def test_slow_query_log(self, client, title, settings, caplog):
+        settings.SLOW_QUERY_THRESHOLD_MS = 0.000001
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            client.get(f'/api/v1/titles/{title.id}/')
+        events = [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == 'api.queries'
+        ]
+        assert events, 'Запросы дольше порога должны попадать в лог'
+        assert events[0]['kind'] == 'slow_query'
+        assert events[0]['view'] == 'TitleViewSet.retrieve', (
+            'В событии должно быть имя представления'
+        )
+        assert events[0]['frame'].startswith('api/'), events[0]['frame']
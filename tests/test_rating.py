@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def reviews_url(self, title):
+        return f'/api/v1/titles/{title.id}/reviews/'
+
+    def test_rating_follows_review_writes(self, title, user_client,
+                                          another_user_client):
+        response = user_client.post(
+            self.reviews_url(title), data={'text': 'Отзыв', 'score': 10}
+        )
+        assert response.status_code == 201
+        another_user_client.post(
+            self.reviews_url(title), data={'text': 'Отзыв', 'score': 5}
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (15, 2)
+        assert title.rating == 7.5
+
+        review_url = f'{self.reviews_url(title)}{response.data["id"]}/'
+        user_client.patch(review_url, data={'score': 1})
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (6, 2)
+
+        user_client.delete(review_url)
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (5, 1)
+        assert title.rating == 5
+
+    def test_title_list_reads_stored_rating(self, client, title,
+                                            user_client):
+        user_client.post(
+            self.reviews_url(title), data={'text': 'Отзыв', 'score': 8}
+        )
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['rating'] == 8
+        assert 'rating_sum' not in response.json()
+
+    def test_rebuild_ratings_command(self, title, user_client):
+        user_client.post(
+            self.reviews_url(title), data={'text': 'Отзыв', 'score': 4}
+        )
+        Title.objects.filter(pk=title.pk).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (4, 1)
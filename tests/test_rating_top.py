@@ -0,0 +1,116 @@
+import pytest
+
+from reviews.models import Category, Review, ScoreCount, Title
+from reviews.ratings import rebuild_ratings
+
+
+@pytest.fixture
+def readers(django_user_model):
+    return [
+        django_user_model.objects.create_user(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+        )
+        for number in range(4)
+    ]
+
+
+def make_title(admin, category, name, scores, readers):
+    title = Title.objects.create(
+        author=admin, name=name, year=2000, category=category
+    )
+    for reader, score in zip(readers, scores):
+        Review.objects.create(title=title, author=reader, text='', score=score)
+    return title
+
+
+@pytest.mark.django_db
+class TestRatingHistogram:
+
+    def test_histogram_follows_reviews(self, client, title, readers,
+                                       django_assert_num_queries):
+        reviews = [
+            Review.objects.create(
+                title=title, author=reader, text='', score=score
+            )
+            for reader, score in zip(readers, (8, 8, 3))
+        ]
+        reviews[0].score = 10
+        reviews[0].save()
+        reviews[2].delete()
+        url = f'/api/v1/titles/{title.id}/rating-histogram/'
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 2
+        assert data['histogram'] == {
+            str(score): {8: 1, 10: 1}.get(score, 0) for score in range(1, 11)
+        }, 'Гистограмма должна следовать за созданием, правкой и удалением'
+
+    def test_missing_title(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.id}/rating-histogram/')
+        assert response.json()['count'] == 0
+        assert client.get(
+            '/api/v1/titles/999/rating-histogram/'
+        ).status_code == 404
+
+    def test_rebuild_fixes_histogram(self, title, readers):
+        Review.objects.create(title=title, author=readers[0], text='', score=4)
+        ScoreCount.objects.update(count=7)
+        assert rebuild_ratings() == [title.id]
+        assert list(ScoreCount.objects.values_list('score', 'count')) == [
+            (4, 1)
+        ]
+
+    def test_rebuild_many_titles(self, admin, category, readers):
+        Title.objects.bulk_create(
+            Title(author=admin, name=f'Фильм {number}', year=2000,
+                  category=category)
+            for number in range(600)
+        )
+        Review.objects.bulk_create(
+            Review(title=title, author=readers[0], text='', score=5)
+            for title in Title.objects.all()
+        )
+        assert len(rebuild_ratings()) == 600
+        assert ScoreCount.objects.filter(score=5, count=1).count() == 600, (
+            'Гистограммы должны восстанавливаться пачками любого размера'
+        )
+
+
+@pytest.mark.django_db
+class TestTopTitles:
+
+    def test_ranking(self, client, admin, category, readers, settings):
+        settings.TOP_TITLES_MIN_REVIEWS = 2
+        book = Category.objects.create(name='Книга', slug='book')
+        make_title(admin, category, 'Средний', (6, 7), readers)
+        make_title(admin, category, 'Лучший', (9, 10, 9), readers)
+        make_title(admin, category, 'Мало отзывов', (10,), readers)
+        make_title(admin, book, 'Книга', (8, 8), readers)
+        names = [item['name'] for item in client.get(
+            '/api/v1/titles/top/').json()]
+        assert names == ['Лучший', 'Книга', 'Средний'], (
+            'Топ должен идти по убыванию рейтинга и учитывать '
+            'минимальное число отзывов'
+        )
+        names = [item['name'] for item in client.get(
+            '/api/v1/titles/top/?category=book').json()]
+        assert names == ['Книга']
+        assert len(client.get('/api/v1/titles/top/?limit=1').json()) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_cached_until_review(self, client, admin, category, readers,
+                                 settings):
+        settings.TOP_TITLES_MIN_REVIEWS = 1
+        title = make_title(admin, category, 'Фильм', (5,), readers)
+        client.get('/api/v1/titles/top/')
+        assert client.get('/api/v1/titles/top/')['X-Cache'] == 'HIT'
+        Review.objects.create(
+            title=title, author=readers[1], text='', score=9
+        )
+        response = client.get('/api/v1/titles/top/')
+        assert response['X-Cache'] == 'MISS', (
+            'Новый отзыв должен сбрасывать закэшированный топ'
+        )
+        assert response.json()[0]['rating'] == 7
@@ -0,0 +1,108 @@
+import pytest
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.test.utils import CaptureQueriesContext
+
+from api import db
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.JWT_USER_CACHE_TIMEOUT = 0
+    settings.CATALOG_CACHE_ENABLED = False
+    monkeypatch.setattr(db, 'down_until', {})
+
+
+def create_title(admin_client, category):
+    response = admin_client.post('/api/v1/titles/', data={
+        'name': 'Фильм', 'year': 2000, 'category': category.slug,
+    })
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, replica, client, admin_client,
+                                 category):
+        create_title(admin_client, category)
+        with CaptureQueriesContext(connections['replica']) as context:
+            response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 0, (
+            'Чтение должно идти в реплику, где изменений ещё нет'
+        )
+        assert context.captured_queries
+
+    def test_writer_pinned_to_primary(self, replica, admin_client,
+                                      category):
+        create_title(admin_client, category)
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == 1, (
+            'После записи клиент должен читать свои изменения из default'
+        )
+        cache.clear()
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0, (
+            'После окна привязки чтение снова должно идти в реплику'
+        )
+
+    def test_replica_down_falls_back(self, replica, client, admin_client,
+                                     category, monkeypatch):
+        create_title(admin_client, category)
+        calls = []
+
+        def refuse():
+            calls.append(1)
+            raise OperationalError('connection refused')
+
+        monkeypatch.setattr(
+            connections['replica'], 'ensure_connection', refuse
+        )
+        for _ in range(2):
+            assert client.get('/api/v1/titles/').json()['count'] == 1, (
+                'Без доступной реплики чтение должно идти в default'
+            )
+        assert len(calls) == 1, (
+            'Недоступную реплику не нужно проверять на каждом запросе'
+        )
+
+    def test_cache_filled_from_primary(self, replica, client, admin_client,
+                                      category, settings):
+        settings.CATALOG_CACHE_ENABLED = True
+        create_title(admin_client, category)
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1, (
+            'Ответ, который кладётся в кэш, должен читаться из default: '
+            'иначе данные отстающей реплики легли бы под новую версию'
+        )
+
+    def test_snapshot_built_from_primary(self, replica, client,
+                                         admin_client, category, settings):
+        settings.TITLE_SNAPSHOT_ENABLED = True
+        create_title(admin_client, category)
+        response = client.get('/api/v1/titles/')
+        assert response['X-Snapshot'] == 'MISS'
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db(
+        databases=['default', 'replica'], transaction=True
+    )
+    def test_jwt_user_cache_filled_from_primary(self, replica, user,
+                                                user_client, settings):
+        settings.JWT_USER_CACHE_TIMEOUT = 60
+        assert user_client.get('/api/v1/titles/').status_code == 200, (
+            'Пользователь для кэша JWT должен читаться из default: '
+            'в отстающей реплике его может ещё не быть'
+        )
+        user.role = 'admin'
+        user.save()
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'После смены роли в кэш должна лечь роль из default'
+        )
+
+    def test_replica_object_saved_to_primary(self, replica, category):
+        category.name = 'Правка'
+        category._state.db = 'replica'
+        category.save()
+        assert category._state.db == 'default'
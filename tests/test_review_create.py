@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+
+    def post_review(self, client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Отзыв', 'score': 7})
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'reviews_review' in query['sql']
+        ]
+        return response, selects
+
+    def test_create_without_exists_query(self, user_client, title):
+        response, selects = self.post_review(user_client, title)
+        assert response.status_code == 201, (
+            'Создание отзыва должно возвращать статус 201'
+        )
+        assert not selects, (
+            'Перед созданием отзыва не должно быть отдельной проверки '
+            f'на дубликат:\n{selects}'
+        )
+
+    def test_duplicate_returns_400(self, user_client, user, title):
+        Review.objects.create(title=title, author=user, text='', score=5)
+        response, selects = self.post_review(user_client, title)
+        assert response.status_code == 400, (
+            'Повторный отзыв того же автора должен возвращать статус 400'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Author review is alredy exist']
+        }, 'Ответ на повторный отзыв должен сохранить прежний формат'
+        assert not selects, (
+            'Дубликат должен определяться ограничением в базе, '
+            f'а не отдельным запросом:\n{selects}'
+        )
+        title.refresh_from_db()
+        assert title.rating_count == 1, (
+            'Отклонённый отзыв не должен менять рейтинг произведения'
+        )
+
+    def test_unknown_title_returns_404(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/0/reviews/', data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == 404, (
+            'Отзыв к несуществующему произведению должен возвращать 404'
+        )
@@ -0,0 +1,46 @@
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    @pytest.fixture
+    def titles(self, admin, category):
+        return [
+            Title.objects.create(
+                author=admin, name='Крёстный отец', year=1972,
+                description='Семейная сага', category=category
+            ),
+            Title.objects.create(
+                author=admin, name='Сага о Форсайтах', year=1922,
+                description='Роман о семье', category=category
+            ),
+            Title.objects.create(
+                author=admin, name='Игра', year=1997,
+                description='Триллер', category=category
+            ),
+        ]
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == 200
+        return [item['name'] for item in response.json()['results']]
+
+    def test_name_matches_rank_first(self, client, titles):
+        assert self.search(client, 'сага') == [
+            'Сага о Форсайтах', 'Крёстный отец'
+        ]
+
+    def test_all_terms_required(self, client, titles):
+        assert self.search(client, 'роман семье') == ['Сага о Форсайтах']
+        assert self.search(client, 'роман триллер') == []
+
+    def test_search_combines_with_filters(self, client, titles):
+        response = client.get(
+            '/api/v1/titles/', {'search': 'сага', 'year': 1972}
+        )
+        assert [item['name'] for item in response.json()['results']] == [
+            'Крёстный отец'
+        ]
@@ -0,0 +1,95 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Review, Title
+
+
+@pytest.fixture
+def snapshots(settings):
+    settings.TITLE_SNAPSHOT_ENABLED = True
+
+
+@pytest.fixture
+def catalog(admin, category, genres):
+    for number in range(12):
+        title = Title.objects.create(
+            author=admin, name=f'Произведение {number}', year=2000 + number % 2,
+            category=category,
+        )
+        title.genre.set(genres[:1 + number % 2])
+
+
+@pytest.mark.django_db
+class TestTitleSnapshots:
+
+    def test_snapshot_matches_list(self, client, settings, snapshots,
+                                   catalog, django_assert_num_queries):
+        urls = [
+            '/api/v1/titles/',
+            '/api/v1/titles/?offset=10',
+            '/api/v1/titles/?genre=comedy&limit=10',
+            '/api/v1/titles/?year=2001',
+        ]
+        for url in urls:
+            assert client.get(url)['X-Snapshot'] == 'MISS'
+            with django_assert_num_queries(0):
+                hit = client.get(url)
+            assert hit['X-Snapshot'] == 'HIT', (
+                f'Повторный запрос {url} должен отдаваться из снимка'
+            )
+            settings.TITLE_SNAPSHOT_ENABLED = False
+            expected = client.get(url).json()
+            settings.TITLE_SNAPSHOT_ENABLED = True
+            assert hit.json() == expected, (
+                f'Снимок {url} должен совпадать с обычным ответом'
+            )
+        assert client.get('/api/v1/titles/').json()['next'] == (
+            'http://testserver/api/v1/titles/?limit=10&offset=10'
+        ), 'Ссылки в снимке должны вести на хост клиента'
+
+    def test_other_requests_bypass(self, client, admin_client, snapshots,
+                                   title):
+        for url in ('/api/v1/titles/?name=Побег', '/api/v1/titles/?limit=5',
+                    '/api/v1/titles/?offset=300', '/api/v1/titles/?year=01994'):
+            assert 'X-Snapshot' not in client.get(url), (
+                f'Запрос {url} не должен отдаваться из снимка'
+            )
+        assert 'X-Snapshot' not in admin_client.get('/api/v1/titles/'), (
+            'Снимки предназначены только для анонимных запросов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_review_refreshes_groups(self, client, user, snapshots, title):
+        url = '/api/v1/titles/?category=movie'
+        client.get(url)
+        Review.objects.create(title=title, author=user, text='', score=8)
+        response = client.get(url)
+        assert response['X-Snapshot'] == 'MISS', (
+            'Новый отзыв должен сбрасывать снимки групп произведения'
+        )
+        assert response.json()['results'][0]['rating'] == 8
+
+    @pytest.mark.django_db(transaction=True)
+    def test_move_between_groups(self, client, snapshots, title):
+        other = Category.objects.create(name='Книга', slug='book')
+        client.get('/api/v1/titles/?category=movie')
+        client.get('/api/v1/titles/?category=book')
+        title.category = other
+        title.save()
+        assert client.get('/api/v1/titles/?category=movie').json()[
+            'count'] == 0, 'Старая категория должна потерять произведение'
+        assert client.get('/api/v1/titles/?category=book').json()[
+            'count'] == 1, 'Новая категория должна получить произведение'
+
+    def test_build_command(self, client, snapshots, catalog):
+        call_command(
+            'build_title_snapshots', '--base-url', 'http://testserver',
+            stdout=io.StringIO(),
+        )
+        for url in ('/api/v1/titles/?offset=10', '/api/v1/titles/?genre=drama',
+                    '/api/v1/titles/?year=2000&limit=10'):
+            assert client.get(url)['X-Snapshot'] == 'HIT', (
+                f'Команда должна заранее построить снимок {url}'
+            )
@@ -0,0 +1,96 @@
+import pytest
+
+from reviews.deletion import purge_hidden
+from reviews.models import Comment, GenreTitle, Review, ScoreCount, Title
+
+
+@pytest.fixture
+def review(user, title):
+    review = Review.objects.create(
+        title=title, author=user, text='Отзыв', score=4
+    )
+    Comment.objects.create(review=review, author=user, text='Ответ')
+    return review
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+
+    def test_title_hidden_at_once(self, admin_client, client, review):
+        title = review.title
+        response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 204
+        assert Title.all_objects.filter(pk=title.id, is_hidden=True).exists()
+        assert Review.all_objects.filter(pk=review.id).exists(), (
+            'Зависимые строки удаляются не в запросе, а командой purge_hidden'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        assert client.get(f'/api/v1/titles/{title.id}/').status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{title.id}/rating-histogram/'
+        ).status_code == 404, 'Гистограмма скрытого произведения не отдаётся'
+        comments = (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        )
+        assert client.get(comments).status_code == 404, (
+            'Комментарии скрытого произведения не должны отдаваться'
+        )
+
+    def test_review_hidden_and_rating_updated(self, user_client, client,
+                                              another_user, review):
+        title = review.title
+        Review.objects.create(
+            title=title, author=another_user, text='', score=8
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.delete(f'{url}{review.id}/')
+        assert response.status_code == 204
+        assert client.get(url).json()['count'] == 1
+        assert client.get(f'{url}{review.id}/comments/').status_code == 404
+        assert client.get(f'/api/v1/titles/{title.id}/').json()['rating'] == 8
+        histogram = client.get(
+            f'/api/v1/titles/{title.id}/rating-histogram/'
+        ).json()
+        assert histogram['histogram']['4'] == 0, (
+            'Оценка скрытого отзыва должна сразу уйти из гистограммы'
+        )
+        response = user_client.post(url, data={'text': 'Снова', 'score': 6})
+        assert response.status_code == 201, (
+            'После удаления отзыва автор может написать новый'
+        )
+
+    def test_delete_author_of_hidden_review(self, user_client, user,
+                                            another_user, review):
+        title = review.title
+        Review.objects.create(
+            title=title, author=another_user, text='', score=8
+        )
+        user_client.delete(f'/api/v1/titles/{title.id}/reviews/{review.id}/')
+        user.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (8, 1), (
+            'Оценка скрытого отзыва не должна вычитаться повторно'
+        )
+        assert dict(ScoreCount.objects.filter(title=title).values_list(
+            'score', 'count'
+        )) == {4: 0, 8: 1}
+
+    def test_purge_removes_dependents(self, admin_client, user_client,
+                                      review, admin, category):
+        title = review.title
+        kept = Title.objects.create(
+            author=admin, name='Другое', year=2001, category=category
+        )
+        Review.objects.create(title=kept, author=admin, text='', score=9)
+        user_client.delete(f'/api/v1/titles/{title.id}/reviews/{review.id}/')
+        admin_client.delete(f'/api/v1/titles/{title.id}/')
+        counts = purge_hidden(batch_size=1, pause=0)
+        assert counts == {'comments': 1, 'reviews': 1, 'titles': 1}
+        assert list(Title.all_objects.all()) == [kept]
+        assert Review.all_objects.filter(title=kept).count() == 1
+        assert not Comment.objects.exists()
+        assert not GenreTitle.objects.filter(title_id=title.id).exists()
+        assert not ScoreCount.objects.filter(title_id=title.id).exists()
+        assert purge_hidden(pause=0) == {
+            'comments': 0, 'reviews': 0, 'titles': 0
+        }
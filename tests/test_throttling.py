@@ -0,0 +1,88 @@
+import pytest
+
+from api.throttling import BucketThrottle, take_token
+
+
+@pytest.fixture
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'auth': '2/min', 'write': '3/min'},
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(BucketThrottle, 'timer', lambda self: now[0])
+    return now
+
+
+def token(client, address='10.0.0.1'):
+    return client.post(
+        '/api/v1/auth/token/',
+        data={'username': 'nobody', 'confirmation_code': 'x'},
+        REMOTE_ADDR=address,
+    )
+
+
+class TestTokenBucket:
+
+    def test_burst_then_refill(self):
+        state = None
+        for _ in range(3):
+            state, wait = take_token(state, 3, 0.5, 10.0)
+            assert wait == 0
+        state, wait = take_token(state, 3, 0.5, 10.0)
+        assert wait == 2, 'Пустая корзина должна ждать один токен'
+        state, wait = take_token(state, 3, 0.5, 12.0)
+        assert wait == 0
+        assert state == (0, 12.0)
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    def test_auth_limited_per_ip(self, client, rates, clock):
+        assert [token(client).status_code for _ in range(2)] == [404, 404]
+        response = token(client)
+        assert response.status_code == 429, (
+            'Третий запрос токена за минуту должен отклоняться'
+        )
+        assert response['Retry-After'] == '30'
+        assert token(client, '10.0.0.2').status_code == 404, (
+            'Счётчики разных IP должны быть независимы'
+        )
+        clock[0] += 30
+        assert token(client).status_code == 404, (
+            'Корзина должна пополняться со временем'
+        )
+
+    def test_signup_shares_auth_scope(self, client, rates, clock):
+        token(client)
+        token(client)
+        response = client.post(
+            '/api/v1/auth/signup/', data={}, REMOTE_ADDR='10.0.0.1'
+        )
+        assert response.status_code == 429
+
+    def test_write_limited_per_user(self, user_client, another_user_client,
+                                    title, rates, clock):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 5}
+        statuses = [
+            user_client.post(url, data=data).status_code for _ in range(4)
+        ]
+        assert statuses == [201, 400, 400, 429], (
+            'Изменяющие запросы пользователя должны ограничиваться'
+        )
+        assert user_client.get(url).status_code == 200, (
+            'Чтение не должно ограничиваться'
+        )
+        assert another_user_client.post(url, data=data).status_code == 201
+
+    def test_cache_store(self, client, rates, clock, settings):
+        settings.THROTTLE_STORE = 'api.throttling.CacheBucketStore'
+        assert [token(client).status_code for _ in range(3)] == [
+            404, 404, 429
+        ]
@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_query_count(client, url, expected):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Запрос `{url}` вернул статус {response.status_code}'
+    )
+    queries = '\n'.join(query['sql'] for query in context.captured_queries)
+    assert len(context) == expected, (
+        f'Запрос `{url}` выполнил {len(context)} SQL-запросов вместо '
+        f'{expected}:\n{queries}'
+    )
+    return response
+
+
+def explain(sql):
+    prefix = connection.ops.explain_query_prefix()
+    with connection.cursor() as cursor:
+        cursor.execute(f'{prefix} {sql}')
+        return '\n'.join(' '.join(map(str, row)) for row in cursor.fetchall())
+
+
+def is_seq_scan(plan_line, table):
+    if connection.vendor == 'postgresql':
+        return f'Seq Scan on {table}' in plan_line
+    words = plan_line.replace('SCAN TABLE', 'SCAN').split()
+    return (
+        'SCAN' in words
+        and words[words.index('SCAN') + 1:][:1] == [table]
+        and 'USING' not in words
+    )
+
+
+def assert_no_seq_scan(client, url, tables):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Запрос `{url}` вернул статус {response.status_code}'
+    )
+    for query in context.captured_queries:
+        if not query['sql'].startswith('SELECT'):
+            continue
+        plan = explain(query['sql'])
+        for line in plan.splitlines():
+            for table in tables:
+                assert not is_seq_scan(line, table), (
+                    f'Запрос `{url}` читает {table} полным перебором:\n'
+                    f'{query["sql"]}\n{plan}'
+                )
+            assert 'TEMP B-TREE FOR ORDER BY' not in line, (
+                f'Запрос `{url}` сортирует без индекса:\n'
+                f'{query["sql"]}\n{plan}'
+            )
@@ -1,5 +1,15 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'to', 'subject', 'status', 'attempts', 'created')
+    list_filter = ('status',)
+    search_fields = ('to',)
+    # В тексте письма код подтверждения.
+    exclude = ('body',)
+
 
 admin.site.register(User)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:27
+
+from django.db import migrations, models
+
+
+def clear_sent_bodies(apps, schema_editor):
+    OutgoingEmail = apps.get_model('users', 'OutgoingEmail')
+    OutgoingEmail.objects.filter(status='sent').update(body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outgoingemail',
+            name='body',
+            field=models.TextField(blank=True, verbose_name='Текст'),
+        ),
+        migrations.RunPython(clear_sent_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, body, to):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=settings.EMAIL_HOST_USER or '',
+        to=to,
+    )
+
+
+def postpone(email, error, max_attempts, retry_delay):
+    email.last_error = repr(error)
+    if email.attempts >= max_attempts:
+        email.status = OutgoingEmail.FAILED
+    email.next_attempt_at = timezone.now() + timedelta(
+        seconds=retry_delay * 2 ** (email.attempts - 1)
+    )
+
+
+def send_batch(connection, batch, max_attempts, retry_delay):
+    sent = 0
+    for email in batch:
+        message = EmailMessage(
+            email.subject,
+            email.body,
+            email.from_email or None,
+            [email.to],
+            connection=connection,
+        )
+        email.attempts += 1
+        try:
+            message.send()
+        except Exception as error:
+            postpone(email, error, max_attempts, retry_delay)
+        else:
+            sent += 1
+            email.status = OutgoingEmail.SENT
+            email.sent_at = timezone.now()
+            email.body = ''
+    return sent
+
+
+def send_pending(batch_size=100, max_attempts=5, retry_delay=60):
+    """Отправляет пачку писем из очереди через одно соединение.
+
+    Неудачные письма откладываются с экспоненциально растущей паузой,
+    после max_attempts попыток получают статус failed. Если соединение
+    открыть не удалось, так откладывается вся пачка. Текст отправленного
+    письма стирается: в нём код подтверждения.
+    Возвращает количество отправленных и отложенных писем.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=OutgoingEmail.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            sent = 0
+            for email in batch:
+                email.attempts += 1
+                postpone(email, error, max_attempts, retry_delay)
+        else:
+            try:
+                sent = send_batch(connection, batch, max_attempts, retry_delay)
+            finally:
+                connection.close()
+        OutgoingEmail.objects.bulk_update(batch, [
+            'status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error',
+            'body',
+        ])
+    return sent, len(batch) - sent